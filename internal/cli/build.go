@@ -3,6 +3,7 @@ package cli
 import (
 	"encoding/json"
 	"fmt"
+	"io"
 	"os"
 
 	"github.com/mensfeld/code-on-incus/internal/container"
@@ -46,7 +47,13 @@ The build script should be a bash script that will be executed as root in the co
 Examples:
   coi build custom my-rust-image --script build-rust.sh
   coi build custom my-image --base coi --script setup.sh
-  coi build custom my-image --base images:ubuntu/24.04 --script setup.sh`,
+  coi build custom my-image --base images:ubuntu/24.04 --script setup.sh
+  coi build custom my-image --script setup.sh --log-format json
+
+With --log-format json, build progress is written to stderr as one JSON
+object per line: {"event":"log","message":...} for progress messages and
+e.g. {"event":"dns_autofix","reason":...} for notable build events.
+Output of the build script itself is passed through unchanged.`,
 	Args: cobra.ExactArgs(1),
 	RunE: buildCustomCommand,
 }
@@ -58,6 +65,8 @@ func init() {
 	buildCustomCmd.Flags().String("script", "", "Path to build script (required)")
 	buildCustomCmd.Flags().String("base", "", "Base image to build from (default: coi)")
 	buildCustomCmd.Flags().BoolVar(&buildForce, "force", false, "Force rebuild even if image exists")
+	buildCustomCmd.Flags().String("log-format", "text", "Build log format: text or json")
+	buildCustomCmd.Flags().String("network", "", "Incus network for the build container (default: from profile)")
 	_ = buildCustomCmd.MarkFlagRequired("script") // Always succeeds for valid flag names.
 
 	buildCmd.AddCommand(buildCustomCmd)
@@ -105,6 +114,13 @@ func buildCustomCommand(cmd *cobra.Command, args []string) error {
 	imageName := args[0]
 	scriptPath, _ := cmd.Flags().GetString("script")
 	baseImage, _ := cmd.Flags().GetString("base")
+	logFormat, _ := cmd.Flags().GetString("log-format")
+	networkName, _ := cmd.Flags().GetString("network")
+
+	// Validate log format
+	if logFormat != "text" && logFormat != "json" {
+		return fmt.Errorf("invalid log format '%s': must be 'text' or 'json'", logFormat)
+	}
 
 	// Check if Incus is available
 	if !container.Available() {
@@ -128,14 +144,27 @@ func buildCustomCommand(cmd *cobra.Command, args []string) error {
 		Description: fmt.Sprintf("Custom image: %s", imageName),
 		BaseImage:   baseImage,
 		BuildScript: scriptPath,
+		Network:     networkName,
 		Force:       buildForce,
 		Logger: func(msg string) {
 			fmt.Fprintf(os.Stderr, "%s\n", msg)
 		},
 	}
+	if logFormat == "json" {
+		opts.Logger = func(msg string) {
+			writeJSONLine(os.Stderr, map[string]string{"event": "log", "message": msg})
+		}
+		opts.Event = func(name string, fields map[string]string) {
+			line := map[string]string{"event": name}
+			for k, v := range fields {
+				line[k] = v
+			}
+			writeJSONLine(os.Stderr, line)
+		}
+	}
 
 	// Build the image
-	fmt.Fprintf(os.Stderr, "Building custom image '%s' from '%s'...\n", imageName, baseImage)
+	opts.Logger(fmt.Sprintf("Building custom image '%s' from '%s'...", imageName, baseImage))
 	builder := image.NewBuilder(opts)
 	result := builder.Build()
 
@@ -151,7 +180,7 @@ func buildCustomCommand(cmd *cobra.Command, args []string) error {
 
 	if !result.Skipped {
 		output["fingerprint"] = result.Fingerprint
-	} else {
+	} else if logFormat == "text" {
 		fmt.Fprintf(os.Stderr, "\nImage already exists. Use --force to rebuild.\n")
 	}
 
@@ -160,3 +189,9 @@ func buildCustomCommand(cmd *cobra.Command, args []string) error {
 
 	return nil
 }
+
+// writeJSONLine writes fields as a single-line JSON object
+func writeJSONLine(w io.Writer, fields map[string]string) {
+	line, _ := json.Marshal(fields)
+	fmt.Fprintln(w, string(line))
+}
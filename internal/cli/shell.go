@@ -21,6 +21,7 @@ var (
 	debugShell bool
 	background bool
 	useTmux    bool
+	printName  bool
 )
 
 var shellCmd = &cobra.Command{
@@ -44,6 +45,7 @@ Examples:
   coi shell --continue=<session-id> # Same as --resume (alias)
   coi shell --slot 2                # Use specific slot
   coi shell --debug                 # Launch bash for debugging
+  coi shell --background --print-name  # Print the container name on stdout (for scripts)
 `,
 	RunE: shellCommand,
 }
@@ -52,6 +54,7 @@ func init() {
 	shellCmd.Flags().BoolVar(&debugShell, "debug", false, "Launch interactive bash instead of AI tool (for debugging)")
 	shellCmd.Flags().BoolVar(&background, "background", false, "Run AI tool in background tmux session (detached)")
 	shellCmd.Flags().BoolVar(&useTmux, "tmux", true, "Use tmux for session management (default true)")
+	shellCmd.Flags().BoolVar(&printName, "print-name", false, "Print the container name on stdout once it is set up")
 }
 
 func shellCommand(cmd *cobra.Command, args []string) error {
@@ -220,6 +223,11 @@ func shellCommand(cmd *cobra.Command, args []string) error {
 		return fmt.Errorf("failed to setup session: %w", err)
 	}
 
+	// All other output goes to stderr, so scripts can read just the name
+	if printName {
+		fmt.Println(result.ContainerName)
+	}
+
 	// Save metadata early so coi list shows correct persistent/ephemeral status
 	if err := session.SaveMetadataEarly(sessionsDir, sessionID, result.ContainerName, absWorkspace, persistent); err != nil {
 		fmt.Fprintf(os.Stderr, "Warning: Failed to save early metadata: %v\n", err)
@@ -235,9 +235,14 @@ func LaunchContainer(imageAlias, containerName string) error {
 	return enableDockerSupport(containerName)
 }
 
-// LaunchContainerPersistent launches a non-ephemeral container
-func LaunchContainerPersistent(imageAlias, containerName string) error {
+// LaunchContainerPersistent launches a non-ephemeral container. When
+// networkName is set, its NIC is attached to that network instead of the
+// profile's default.
+func LaunchContainerPersistent(imageAlias, containerName, networkName string) error {
 	args := []string{"launch", imageAlias, containerName}
+	if networkName != "" {
+		args = append(args, "--network", networkName)
+	}
 	if err := IncusExec(args...); err != nil {
 		return err
 	}
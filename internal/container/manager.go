@@ -41,7 +41,7 @@ func (m *Manager) Launch(image string, ephemeral bool) error {
 	if ephemeral {
 		return LaunchContainer(image, m.ContainerName)
 	}
-	return LaunchContainerPersistent(image, m.ContainerName)
+	return LaunchContainerPersistent(image, m.ContainerName, "")
 }
 
 // Stop stops the container
@@ -25,7 +25,12 @@ type BuildOptions struct {
 	BaseImage   string
 	Force       bool
 	BuildScript string // For custom images
+	Network     string // Network for the build container (default: from profile)
 	Logger      func(string)
+
+	// Event, if set, receives structured build events (e.g. "dns_autofix")
+	// in addition to the human-readable Logger messages
+	Event func(name string, fields map[string]string)
 }
 
 // BuildResult contains the result of an image build
@@ -126,7 +131,7 @@ func (b *Builder) Build() *BuildResult {
 func (b *Builder) launchBuildContainer() error {
 	b.opts.Logger(fmt.Sprintf("Launching build container from %s...", b.opts.BaseImage))
 
-	if err := b.mgr.Launch(b.opts.BaseImage, false); err != nil {
+	if err := container.LaunchContainerPersistent(b.opts.BaseImage, b.mgr.ContainerName, b.opts.Network); err != nil {
 		return fmt.Errorf("failed to launch build container: %w", err)
 	}
 
@@ -280,12 +285,23 @@ EOF`, container.ExecCommandOptions{Capture: true})
 		}
 
 		b.opts.Logger("DNS configuration fixed (using 8.8.8.8, 8.8.4.4, 1.1.1.1)")
+		b.emit("dns_autofix", map[string]string{
+			"reason":      reason,
+			"nameservers": "8.8.8.8,8.8.4.4,1.1.1.1",
+		})
 		return true
 	}
 
 	return false
 }
 
+// emit reports a structured build event if an Event hook is configured
+func (b *Builder) emit(name string, fields map[string]string) {
+	if b.opts.Event != nil {
+		b.opts.Event(name, fields)
+	}
+}
+
 // logDNSFixWarning logs a warning about the DNS misconfiguration and how to permanently fix it
 func (b *Builder) logDNSFixWarning() {
 	b.opts.Logger("")
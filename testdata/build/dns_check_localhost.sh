@@ -0,0 +1,10 @@
+#!/bin/bash
+set -e
+echo "Testing DNS resolution after localhost DNS fix..."
+# This should work after auto-fix
+if getent hosts archive.ubuntu.com > /dev/null 2>&1; then
+    echo "DNS resolution works!"
+else
+    echo "DNS resolution failed!"
+    exit 1
+fi
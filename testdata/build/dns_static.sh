@@ -0,0 +1,41 @@
+#!/bin/bash
+set -e
+echo "Testing DNS resolution..."
+# This should work after auto-fix
+if getent hosts archive.ubuntu.com > /dev/null 2>&1; then
+    echo "DNS resolution works!"
+else
+    echo "DNS resolution failed!"
+    exit 1
+fi
+
+echo "Configuring static DNS for persistence test..."
+
+# ALWAYS configure static DNS for image persistence
+# (Don't check if DNS works - the builder may have already fixed it temporarily)
+
+# Disable systemd-resolved if present
+systemctl disable systemd-resolved 2>/dev/null || true
+systemctl stop systemd-resolved 2>/dev/null || true
+systemctl mask systemd-resolved 2>/dev/null || true
+
+# Disable cloud-init network configuration (prevents DNS reconfiguration on boot)
+mkdir -p /etc/cloud/cloud.cfg.d
+echo "network: {config: disabled}" > /etc/cloud/cloud.cfg.d/99-disable-network-config.cfg
+
+# Disable NetworkManager if present (common on some Ubuntu variants)
+systemctl disable NetworkManager 2>/dev/null || true
+systemctl mask NetworkManager 2>/dev/null || true
+
+# Configure static DNS
+rm -f /etc/resolv.conf
+cat > /etc/resolv.conf << 'DNSEOF'
+nameserver 8.8.8.8
+nameserver 8.8.4.4
+nameserver 1.1.1.1
+DNSEOF
+
+# Make resolv.conf immutable to prevent any service from changing it
+chattr +i /etc/resolv.conf 2>/dev/null || true
+
+echo "Static DNS configured and protected."
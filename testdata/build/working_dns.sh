@@ -0,0 +1,3 @@
+#!/bin/bash
+set -e
+echo "Build with working DNS"
@@ -14,6 +14,7 @@ import time
 from support.helpers import (
     calculate_container_name,
     get_container_list,
+    wait_container_stopped,
 )
 
 
@@ -58,7 +59,7 @@ def test_attach_stopped_container(coi_binary, cleanup_containers, workspace_dir)
 
     assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # === Phase 3: Try to attach to stopped container ===
 
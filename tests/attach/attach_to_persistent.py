@@ -8,17 +8,16 @@ Tests that:
 4. Verify attachment works
 """
 
-import subprocess
-import time
-
-from pexpect import EOF, TIMEOUT
-
 from support.helpers import (
     calculate_container_name,
+    fast_run,
     get_container_list,
+    invalidate_container_cache,
+    poll_until,
     send_prompt,
     spawn_coi,
     wait_for_container_ready,
+    wait_for_eof,
     wait_for_prompt,
     wait_for_text_in_monitor,
     with_live_screen,
@@ -54,7 +53,7 @@ def test_attach_to_persistent(coi_binary, cleanup_containers, workspace_dir):
 
     # Quick interaction
     with with_live_screen(child) as monitor:
-        time.sleep(2)
+        wait_for_text_in_monitor(monitor, "You:", timeout=10, poll_interval=0.1)
         send_prompt(child, "persistent test")
         responded = wait_for_text_in_monitor(monitor, "persistent test-BACK", timeout=30)
         assert responded, "Dummy CLI should respond"
@@ -62,25 +61,17 @@ def test_attach_to_persistent(coi_binary, cleanup_containers, workspace_dir):
     # === Phase 2: Detach with Ctrl+b d (container stays running) ===
 
     # Use tmux detach so claude keeps running
-    child.send("\x02")  # Ctrl+b
-    time.sleep(0.2)
-    child.send("d")  # d for detach
+    child.send("\x02d")  # Ctrl+b d in a single write
 
-    try:
-        child.expect(EOF, timeout=30)
-    except TIMEOUT:
-        pass
+    wait_for_eof(child, timeout=30)
 
     try:
         child.close(force=False)
     except Exception:
         child.close(force=True)
 
-    time.sleep(3)
-
     # Verify container is STILL running (persistent mode)
-    containers = get_container_list()
-    assert container_name in containers, (
+    assert poll_until(lambda: container_name in get_container_list(), timeout=10), (
         f"Persistent container {container_name} should still be running after detach"
     )
 
@@ -94,46 +85,34 @@ def test_attach_to_persistent(coi_binary, cleanup_containers, workspace_dir):
         timeout=60,
     )
 
-    time.sleep(2)
+    # Reattaching redraws the tmux pane, so the dummy prompt reappears
+    wait_for_prompt(child2, timeout=30)
 
     # We should reconnect to tmux session with claude still running
     # Try interacting with dummy again
     with with_live_screen(child2) as monitor:
-        time.sleep(2)
         send_prompt(child2, "after attach")
         responded = wait_for_text_in_monitor(monitor, "after attach-BACK", timeout=30)
 
     # === Phase 4: Cleanup ===
 
-    # Exit CLI
-    child2.send("exit")
-    time.sleep(0.3)
-    child2.send("\x0d")
-    time.sleep(2)
-    # Exit bash
-    child2.send("exit")
-    time.sleep(0.3)
-    child2.send("\x0d")
-
-    try:
-        child2.expect(EOF, timeout=30)
-    except TIMEOUT:
-        pass
+    # Exit CLI, then bash, in one write (the tty keeps the second line for bash)
+    child2.send("exit\x0dexit\x0d")
+    wait_for_eof(child2, timeout=30)
 
     try:
         child2.close(force=False)
     except Exception:
         child2.close(force=True)
 
-    subprocess.run(
+    fast_run(
         [coi_binary, "container", "delete", container_name, "--force"],
         capture_output=True,
         timeout=30,
     )
+    invalidate_container_cache()
 
-    time.sleep(1)
-    containers = get_container_list()
-    assert container_name not in containers, (
+    assert poll_until(lambda: container_name not in get_container_list(), timeout=10), (
         f"Container {container_name} should be deleted after cleanup"
     )
 
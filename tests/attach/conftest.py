@@ -0,0 +1,19 @@
+"""
+Pytest fixtures for attach tests.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="package")
+def workspace_dir(tmp_path_factory):
+    """Provide one workspace directory shared by all attach tests.
+
+    Reusing the workspace keeps container names stable across the attach
+    suite instead of starting every test from a brand new directory.
+    Containers are removed after each test by the cleanup_containers
+    fixture every attach test requests.
+    """
+    workspace = tmp_path_factory.mktemp("attach") / "workspace"
+    workspace.mkdir()
+    return str(workspace)
@@ -6,9 +6,15 @@ Tests that:
 2. Verify it shows session list or usage hint
 """
 
+import os
 import subprocess
 
+import pytest
 
+from support.helpers import get_container_list
+
+
+@pytest.mark.serial
 def test_attach_shows_sessions(coi_binary, cleanup_containers):
     """
     Test that coi attach without arguments shows session list.
@@ -19,13 +25,16 @@ def test_attach_shows_sessions(coi_binary, cleanup_containers):
     3. Verify output shows session info or usage hint
     """
     # Forcefully clean ALL containers to ensure clean state
-    # This prevents issues with leftover containers from previous tests
-    subprocess.run(
-        [coi_binary, "kill", "--all", "--force"],
-        capture_output=True,
-        timeout=30,
-        check=False,
-    )
+    # This prevents issues with leftover containers from previous tests.
+    # Skip the kill round-trip entirely when no coi containers exist.
+    prefix = os.environ.get("COI_CONTAINER_PREFIX", "coi-")
+    if any(c.startswith(prefix) for c in get_container_list()):
+        subprocess.run(
+            [coi_binary, "kill", "--all", "--force"],
+            capture_output=True,
+            timeout=30,
+            check=False,
+        )
 
     # Run coi attach without container name
     result = subprocess.run(
@@ -7,37 +7,70 @@ Tests that:
 3. Build completes successfully with auto-fix
 4. Warning message is displayed about the DNS misconfiguration
 
-This test temporarily modifies the Incus network configuration to simulate
-DNS misconfigurations that occur on various systems:
+This test temporarily modifies the configuration of a dedicated Incus test
+network (see dns_test_network) to simulate DNS misconfigurations that occur
+on various systems:
 - Ubuntu with systemd-resolved (127.0.0.53)
 - Systems with localhost DNS (127.0.0.1)
 """
 
+import asyncio
+import json
+import os
+import re
+import shlex
 import subprocess
-import time
 
 import pytest
 
-
-def get_incus_network():
-    """Get the name of the Incus bridge network."""
-    result = subprocess.run(
-        ["incus", "network", "list", "--format=csv"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    if result.returncode != 0:
-        return None
-
-    # Find a managed bridge network (usually incusbr0)
-    for line in result.stdout.strip().split("\n"):
-        if not line:
+from support.helpers import (
+    fast_run,
+    file_lock,
+    loads_json,
+    run_batch,
+    run_until_marker,
+    scaled_timeout,
+)
+from support.incus_client import IncusClientError, shared_client
+
+# Static build scripts used by these tests (kept on disk instead of being
+# regenerated into tmp_path by every test)
+BUILD_SCRIPTS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "testdata", "build")
+)
+
+# Build output markers, compiled once and matched in a single pass each
+DNS_FIX_RE = re.compile(rb"Detected DNS misconfiguration|DNS configuration fixed")
+DNS_LOCALHOST_RE = re.compile(r"localhost|127\.0\.0", re.IGNORECASE)
+
+# With --log-format json, coi build reports the DNS fix as a single event line.
+# Only the quoted event name is matched, so the marker doesn't depend on the
+# encoder's key order or spacing; build_events() then checks the parsed line.
+DNS_AUTOFIX_EVENT_MARKER = '"dns_autofix"'
+
+# Lock held while a test has the DNS test network's config changed, so
+# DNS-mutating tests never overlap. Always taken after the "coi-build" lock.
+DNS_NETWORK_LOCK = "incus-network-dns"
+
+
+def build_events(output):
+    """Return the JSON event objects from `coi build --log-format json` output.
+
+    Build script output is interleaved as plain text and is skipped. Every
+    line that parses as a JSON object with an "event" key counts, whatever
+    order the keys were written in.
+    """
+    events = []
+    for line in output.splitlines():
+        if not line.startswith("{"):
+            continue
+        try:
+            obj = loads_json(line)
+        except json.JSONDecodeError:
             continue
-        parts = line.split(",")
-        if len(parts) >= 3 and parts[1] == "bridge" and parts[2] == "YES":
-            return parts[0]
-    return None
+        if isinstance(obj, dict) and "event" in obj:
+            events.append(obj)
+    return events
 
 
 def break_dns_config(network_name, dns_server="127.0.0.53"):
@@ -47,368 +80,271 @@ def break_dns_config(network_name, dns_server="127.0.0.53"):
         network_name: Name of the Incus network to configure
         dns_server: DNS server IP to push (default: 127.0.0.53 for systemd-resolved stub)
     """
-    result = subprocess.run(
+    result = fast_run(
         ["incus", "network", "set", network_name, "raw.dnsmasq", f"dhcp-option=6,{dns_server}"],
-        capture_output=True,
-        text=True,
-        timeout=30,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
     )
     return result.returncode == 0
 
 
+def restore_dns_command(network_name):
+    """Return the command that removes the broken DNS configuration."""
+    return ["incus", "network", "unset", network_name, "raw.dnsmasq"]
+
+
+def dns_config_modified(network_name):
+    """Return True if the network may still carry a DNS override.
+
+    Reads the live network config over the Incus API, which is cheaper than
+    an unconditional `incus network unset`. Assumes modified when the API
+    is unreachable so callers fall back to restoring.
+    """
+    try:
+        config = shared_client().network(network_name).get("config") or {}
+    except IncusClientError:
+        return True
+    return "raw.dnsmasq" in config
+
+
 def restore_dns_config(network_name):
     """Remove the broken DNS configuration from Incus network."""
-    subprocess.run(
-        ["incus", "network", "unset", network_name, "raw.dnsmasq"],
-        capture_output=True,
-        timeout=30,
+    fast_run(
+        restore_dns_command(network_name),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
         check=False,
     )
 
 
-def test_build_dns_autofix(coi_binary, tmp_path):
+# Build scenarios shared by the parametrized DNS build test:
+# - "broken": fresh Ubuntu base (not coi, which would inherit the already-fixed
+#   DNS) built while the network pushes a broken 127.0.0.53 resolver. The
+#   script checks DNS, then ALWAYS configures static DNS for persistence -
+#   unconditionally, because the builder's tryFixDNS() may have already fixed
+#   DNS temporarily but the image needs a permanent fix. It also disables
+#   cloud-init network to prevent DNS reconfiguration on boot.
+# - "working": build from the coi image with working DNS.
+DNS_BUILD_SCENARIOS = {
+    "broken": {
+        "image": "coi-test-dns-autofix",
+        "fresh_base": True,
+        "script": "dns_static.sh",
+    },
+    "working": {
+        "image": "coi-test-dns-nochange",
+        "fresh_base": False,
+        "script": "working_dns.sh",
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def dns_build(request, coi_binary, dns_test_network, tmp_path_factory):
     """
-    Test that build auto-fixes DNS misconfiguration.
+    Build the image of one DNS scenario, shared by every check of that scenario.
 
-    This test builds from a fresh Ubuntu base image (not from coi) to ensure
-    the DNS auto-fix is triggered. Building from coi would inherit the already-
-    fixed DNS configuration.
+    The build is the dominant cost in this module (up to 10 minutes), and
+    the checks only differ in what they look at afterwards. For the "broken"
+    scenario the network DNS config is broken for the build and restored
+    right after it; checks that need it broken again break it themselves.
 
-    Flow:
-    1. Get Incus network name
-    2. Break DNS configuration (set 127.0.0.53)
-    3. Clean up any existing build container
-    4. Run coi build custom with --base images:ubuntu/22.04
-    5. Verify build succeeds
-    6. Verify DNS auto-fix messages appear in output
-    7. Restore DNS configuration
+    Yields:
+        (image_name, result) where result is the CompletedProcess of coi build
+        with stderr merged into stdout (read back as bytes from the build log)
     """
-    # Get network name
-    network_name = get_incus_network()
-    if not network_name:
-        pytest.skip("Could not determine Incus network name")
-
-    image_name = "coi-test-dns-autofix"
-
-    # Create minimal build script that verifies DNS works
-    build_script = tmp_path / "build.sh"
-    build_script.write_text(
-        """#!/bin/bash
-set -e
-echo "Testing DNS resolution..."
-# This should work after auto-fix
-if getent hosts archive.ubuntu.com > /dev/null 2>&1; then
-    echo "DNS resolution works!"
-else
-    echo "DNS resolution failed!"
-    exit 1
-fi
-"""
+    scenario = DNS_BUILD_SCENARIOS[request.param]
+    network_name = dns_test_network
+    image_name = scenario["image"]
+    build_script = os.path.join(BUILD_SCRIPTS_DIR, scenario["script"])
+    log_path = tmp_path_factory.mktemp("dns-build") / f"{image_name}.log"
+
+    args = [coi_binary, "build", "custom", image_name, "--script", build_script]
+    if network_name:
+        args += ["--network", network_name]
+    if scenario["fresh_base"]:
+        args += ["--base", request.getfixturevalue("ubuntu_base_image")]
+
+    if request.param == "broken":
+        if not network_name:
+            pytest.skip("Could not create the DNS test network")
+    elif not request.getfixturevalue("coi_base_image_exists"):
+        # Skip if coi base image doesn't exist
+        pytest.skip("coi image not built - run 'coi build' first")
+
+    # Hold the build lock so other xdist workers don't build concurrently, and
+    # the network DNS lock while the network config is touched
+    with file_lock("coi-build"), file_lock(DNS_NETWORK_LOCK):
+        try:
+            if request.param == "broken":
+                # Break DNS configuration
+                if not break_dns_config(network_name):
+                    pytest.skip("Could not modify Incus network configuration (permission denied?)")
+            elif network_name and dns_config_modified(network_name):
+                # Ensure DNS is not broken from a previous (e.g. aborted) run
+                restore_dns_config(network_name)
+
+            # Clean up any existing build container
+            fast_run(
+                ["incus", "delete", "--force", "coi-build"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=scaled_timeout(30),
+                check=False,
+            )
+
+            # Stream the build log to a file rather than a pipe; it stays on
+            # disk next to the other pytest temp files for debugging
+            with open(log_path, "w") as log:
+                result = subprocess.run(
+                    args,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    timeout=scaled_timeout(600),  # Longer timeout for DNS fix + build
+                )
+            # Kept as bytes: the checks only search it, and decoding a large
+            # build log is wasted work unless an assertion has to print it
+            result.stdout = log_path.read_bytes()
+        finally:
+            if request.param == "broken":
+                restore_dns_config(network_name)
+
+    yield image_name, result
+
+    # Cleanup test image
+    fast_run(
+        [coi_binary, "image", "delete", image_name],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
+        check=False,
     )
 
-    try:
-        # Break DNS configuration
-        if not break_dns_config(network_name):
-            pytest.skip("Could not modify Incus network configuration (permission denied?)")
-
-        # Clean up any existing build container
-        subprocess.run(
-            ["incus", "delete", "--force", "coi-build"],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-        # Build custom image from fresh Ubuntu base (not coi) to trigger DNS fix
-        # Using --base images:ubuntu/22.04 ensures we start with broken DNS
-        result = subprocess.run(
-            [
-                coi_binary,
-                "build",
-                "custom",
-                image_name,
-                "--base",
-                "images:ubuntu/22.04",
-                "--script",
-                str(build_script),
-            ],
-            capture_output=True,
-            text=True,
-            timeout=600,  # Longer timeout for DNS fix + build
-        )
-
-        combined_output = result.stdout + result.stderr
-
-        # Build should succeed despite broken DNS
-        assert result.returncode == 0, (
-            f"Build should succeed with DNS auto-fix. "
-            f"Exit code: {result.returncode}\n"
-            f"Output:\n{combined_output}"
-        )
-
-        # Verify DNS auto-fix was applied
-        assert (
-            "Detected DNS misconfiguration" in combined_output
-            or "DNS configuration fixed" in combined_output
-        ), f"Build should show DNS auto-fix message. Output:\n{combined_output}"
-
-        # Verify the build script's DNS check passed
-        assert "DNS resolution works!" in combined_output, (
-            f"DNS should work after auto-fix. Output:\n{combined_output}"
-        )
-
-    finally:
-        # Always restore DNS configuration
-        restore_dns_config(network_name)
-
-        # Cleanup test image
-        subprocess.run(
-            [coi_binary, "image", "delete", image_name],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-
-def test_dns_works_in_container_from_fixed_image(coi_binary, tmp_path):
-    """
-    Test that containers started from a DNS-fixed image have working DNS.
 
-    This verifies that the permanent DNS fix in scripts/build/coi.sh correctly
-    persists static DNS configuration into the built image.
+def check_autofix_output(coi_binary, network_name, image_name, combined_output):
+    """Build output shows the DNS auto-fix and the script's DNS check passing."""
+    # Verify DNS auto-fix was applied
+    assert DNS_FIX_RE.search(combined_output), (
+        "Build should show DNS auto-fix message. "
+        f"Output:\n{combined_output.decode(errors='replace')}"
+    )
+
+    # Verify the build script's DNS check passed
+    assert b"DNS resolution works!" in combined_output, (
+        f"DNS should work after auto-fix. Output:\n{combined_output.decode(errors='replace')}"
+    )
 
-    Flow:
-    1. Break DNS config (set 127.0.0.53)
-    2. Build custom image from fresh Ubuntu base (triggers DNS auto-fix)
-    3. Launch a container from that image
-    4. Test DNS resolution inside the container
-    5. Verify it works (image has static DNS from coi.sh fix)
-    """
-    network_name = get_incus_network()
-    if not network_name:
-        pytest.skip("Could not determine Incus network name")
 
-    image_name = "coi-test-dns-persistence"
+def check_container_dns(coi_binary, network_name, image_name, combined_output):
+    """A container launched from the image resolves names with network DNS broken."""
     container_name = "coi-test-dns-container"
 
-    # Create build script that ALWAYS configures static DNS for persistence
-    # This must be unconditional because the builder's tryFixDNS() may have
-    # already fixed DNS temporarily, but we need a permanent fix in the image
-    # Also disable cloud-init network to prevent DNS reconfiguration on boot
-    build_script = tmp_path / "build.sh"
-    build_script.write_text(
-        """#!/bin/bash
-set -e
-echo "Configuring static DNS for persistence test..."
-
-# ALWAYS configure static DNS for image persistence
-# (Don't check if DNS works - the builder may have already fixed it temporarily)
-
-# Disable systemd-resolved if present
-systemctl disable systemd-resolved 2>/dev/null || true
-systemctl stop systemd-resolved 2>/dev/null || true
-systemctl mask systemd-resolved 2>/dev/null || true
-
-# Disable cloud-init network configuration (prevents DNS reconfiguration on boot)
-mkdir -p /etc/cloud/cloud.cfg.d
-echo "network: {config: disabled}" > /etc/cloud/cloud.cfg.d/99-disable-network-config.cfg
-
-# Disable NetworkManager if present (common on some Ubuntu variants)
-systemctl disable NetworkManager 2>/dev/null || true
-systemctl mask NetworkManager 2>/dev/null || true
-
-# Configure static DNS
-rm -f /etc/resolv.conf
-cat > /etc/resolv.conf << 'DNSEOF'
-nameserver 8.8.8.8
-nameserver 8.8.4.4
-nameserver 1.1.1.1
-DNSEOF
-
-# Make resolv.conf immutable to prevent any service from changing it
-chattr +i /etc/resolv.conf 2>/dev/null || true
-
-echo "Static DNS configured and protected."
-"""
+    # Keep other workers off the network DNS config while it is broken
+    with file_lock(DNS_NETWORK_LOCK):
+        try:
+            # Break DNS configuration
+            if not break_dns_config(network_name):
+                pytest.skip("Could not modify Incus network configuration (permission denied?)")
+
+            # Clean up any existing test container
+            fast_run(
+                ["incus", "delete", "--force", container_name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=scaled_timeout(30),
+                check=False,
+            )
+
+            # Launch a container from the built image and test DNS resolution inside
+            # it in one shell, retrying the lookup briefly while the container boots.
+            # DNS is STILL broken at network level, but image has static DNS
+            image, container = shlex.quote(image_name), shlex.quote(container_name)
+            network = shlex.quote(network_name)
+            result = fast_run(
+                [
+                    "sh",
+                    "-c",
+                    f"incus launch {image} {container} --network {network} && "
+                    "for i in 1 2 3 4 5 6 7 8 9 10; do "
+                    f"incus exec {container} -- getent hosts archive.ubuntu.com && exit 0; "
+                    "sleep 1; done; exit 1",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                timeout=scaled_timeout(90),
+            )
+
+            # Launch should succeed and DNS should work because the IMAGE has static DNS
+            assert result.returncode == 0, (
+                f"Container launch should succeed and DNS should work in container "
+                f"from fixed image. "
+                f"Exit code: {result.returncode}\n"
+                f"Output:\n{result.stdout}"
+            )
+
+        finally:
+            # Always restore DNS configuration and cleanup test container (run concurrently)
+            run_batch(
+                [
+                    restore_dns_command(network_name),
+                    ["incus", "delete", "--force", container_name],
+                ],
+                parallel=True,
+            )
+
+
+def check_no_dns_changes(coi_binary, network_name, image_name, combined_output):
+    """Build output shows no DNS fix when DNS already works."""
+    assert b"Detected DNS misconfiguration" not in combined_output, (
+        "Build should not show DNS fix message when DNS works. "
+        f"Output:\n{combined_output.decode(errors='replace')}"
     )
 
-    try:
-        # Break DNS configuration
-        if not break_dns_config(network_name):
-            pytest.skip("Could not modify Incus network configuration (permission denied?)")
-
-        # Clean up any existing build container and test container
-        subprocess.run(
-            ["incus", "delete", "--force", "coi-build"],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-        subprocess.run(
-            ["incus", "delete", "--force", container_name],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-        # Build custom image from fresh Ubuntu base
-        result = subprocess.run(
-            [
-                coi_binary,
-                "build",
-                "custom",
-                image_name,
-                "--base",
-                "images:ubuntu/22.04",
-                "--script",
-                str(build_script),
-            ],
-            capture_output=True,
-            text=True,
-            timeout=600,
-        )
-
-        assert result.returncode == 0, (
-            f"Build should succeed. Exit code: {result.returncode}\n"
-            f"Output:\n{result.stdout + result.stderr}"
-        )
-
-        # Launch a container from the built image
-        # DNS is STILL broken at network level, but image has static DNS
-        result = subprocess.run(
-            ["incus", "launch", image_name, container_name],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        assert result.returncode == 0, (
-            f"Container launch should succeed. Output:\n{result.stdout + result.stderr}"
-        )
-
-        # Wait for container to be ready
-        time.sleep(5)
-
-        # Test DNS resolution inside the container
-        result = subprocess.run(
-            [
-                "incus",
-                "exec",
-                container_name,
-                "--",
-                "getent",
-                "hosts",
-                "archive.ubuntu.com",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-
-        # DNS should work because the IMAGE has static DNS configured
-        assert result.returncode == 0, (
-            f"DNS should work in container from fixed image. "
-            f"Exit code: {result.returncode}\n"
-            f"Output:\n{result.stdout + result.stderr}"
-        )
-
-    finally:
-        # Always restore DNS configuration
-        restore_dns_config(network_name)
-
-        # Cleanup test container
-        subprocess.run(
-            ["incus", "delete", "--force", container_name],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-        # Cleanup test image
-        subprocess.run(
-            [coi_binary, "image", "delete", image_name],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-
-def test_build_with_working_dns_no_changes(coi_binary, tmp_path):
+
+# One param per scenario: each dns_build value must appear exactly once, or
+# pytest tears the module-scoped fixture down and rebuilds the image for the
+# repeated value. All checks of a scenario run against that single build.
+@pytest.mark.parametrize(
+    ("dns_build", "checks"),
+    [
+        pytest.param("broken", (check_autofix_output, check_container_dns), id="broken-dns"),
+        pytest.param("working", (check_no_dns_changes,), id="working-dns"),
+    ],
+    indirect=["dns_build"],
+)
+def test_build_dns(coi_binary, dns_test_network, dns_build, checks):
     """
-    Test that build doesn't modify DNS when it's already working.
+    Test DNS handling of coi build against a single image per scenario.
 
-    This ensures the auto-fix is conditional and doesn't break
-    properly configured systems.
+    - broken-dns: build with broken DNS (127.0.0.53) auto-fixes it and the
+      build script's DNS check passes; then a container launched from that
+      image has working DNS even with the network DNS still broken (static
+      DNS persisted by the build script)
+    - working-dns: build with working DNS doesn't modify DNS, so the
+      auto-fix is conditional and doesn't break properly configured systems
 
     Flow:
-    1. Ensure DNS is working (restore if needed)
-    2. Run coi build custom
-    3. Verify no DNS modification messages appear
+    1. Build the scenario image via the dns_build fixture
+    2. Verify the build succeeded
+    3. Run the scenario's checks in order
     """
-    # Get network name
-    network_name = get_incus_network()
-    if network_name:
-        # Ensure DNS is not broken from previous test
-        restore_dns_config(network_name)
+    image_name, result = dns_build
+    combined_output = result.stdout
 
-    # Skip if coi base image doesn't exist
-    result = subprocess.run(
-        [coi_binary, "image", "exists", "coi"],
-        capture_output=True,
+    # Build should succeed (despite broken DNS, for the broken scenario)
+    assert result.returncode == 0, (
+        f"Build should succeed. Exit code: {result.returncode}\n"
+        f"Output:\n{combined_output.decode(errors='replace')}"
     )
-    if result.returncode != 0:
-        pytest.skip("coi image not built - run 'coi build' first")
 
-    image_name = "coi-test-dns-nochange"
+    for check in checks:
+        check(coi_binary, dns_test_network, image_name, combined_output)
 
-    # Create minimal build script
-    build_script = tmp_path / "build.sh"
-    build_script.write_text(
-        """#!/bin/bash
-set -e
-echo "Build with working DNS"
-"""
-    )
 
-    try:
-        # Clean up any existing build container
-        subprocess.run(
-            ["incus", "delete", "--force", "coi-build"],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-        # Build custom image
-        result = subprocess.run(
-            [coi_binary, "build", "custom", image_name, "--script", str(build_script)],
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
-
-        combined_output = result.stdout + result.stderr
-
-        # Build should succeed
-        assert result.returncode == 0, (
-            f"Build should succeed. Exit code: {result.returncode}\nOutput:\n{combined_output}"
-        )
-
-        # Should NOT see DNS fix messages (DNS was already working)
-        assert "Detected DNS misconfiguration" not in combined_output, (
-            f"Build should not show DNS fix message when DNS works. Output:\n{combined_output}"
-        )
-
-    finally:
-        # Cleanup test image
-        subprocess.run(
-            [coi_binary, "image", "delete", image_name],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-
-def test_build_dns_autofix_localhost(coi_binary, tmp_path):
+def test_build_dns_autofix_localhost(coi_binary, dns_test_network, ubuntu_base_image):
     """
     Test that build auto-fixes DNS when pointing to localhost (127.0.0.1).
 
@@ -417,100 +353,98 @@ def test_build_dns_autofix_localhost(coi_binary, tmp_path):
     can't reach the host's loopback address.
 
     Flow:
-    1. Get Incus network name
+    1. Get Incus network name (session fixture)
     2. Break DNS configuration (set 127.0.0.1)
     3. Clean up any existing build container
-    4. Run coi build custom with --base images:ubuntu/22.04
-    5. Verify build succeeds
-    6. Verify DNS auto-fix messages mention localhost DNS
+    4. Run coi build custom from a plain Ubuntu 22.04 base
+    5. Verify the build script runs (build stops once DNS markers are seen)
+    6. Verify the dns_autofix event (--log-format json) mentions localhost DNS
     7. Restore DNS configuration
     """
-    # Get network name
-    network_name = get_incus_network()
+    network_name = dns_test_network
     if not network_name:
-        pytest.skip("Could not determine Incus network name")
+        pytest.skip("Could not create the DNS test network")
 
     image_name = "coi-test-dns-localhost"
 
-    # Create minimal build script that verifies DNS works
-    build_script = tmp_path / "build.sh"
-    build_script.write_text(
-        """#!/bin/bash
-set -e
-echo "Testing DNS resolution after localhost DNS fix..."
-# This should work after auto-fix
-if getent hosts archive.ubuntu.com > /dev/null 2>&1; then
-    echo "DNS resolution works!"
-else
-    echo "DNS resolution failed!"
-    exit 1
-fi
-"""
-    )
-
-    try:
-        # Break DNS configuration with 127.0.0.1 (localhost)
-        if not break_dns_config(network_name, "127.0.0.1"):
-            pytest.skip("Could not modify Incus network configuration (permission denied?)")
-
-        # Clean up any existing build container
-        subprocess.run(
-            ["incus", "delete", "--force", "coi-build"],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
-
-        # Build custom image from fresh Ubuntu base (not coi) to trigger DNS fix
-        result = subprocess.run(
-            [
-                coi_binary,
-                "build",
-                "custom",
-                image_name,
-                "--base",
-                "images:ubuntu/22.04",
-                "--script",
-                str(build_script),
-            ],
-            capture_output=True,
-            text=True,
-            timeout=600,  # Longer timeout for DNS fix + build
-        )
-
-        combined_output = result.stdout + result.stderr
-
-        # Build should succeed despite broken DNS
-        assert result.returncode == 0, (
-            f"Build should succeed with DNS auto-fix for localhost DNS. "
-            f"Exit code: {result.returncode}\n"
-            f"Output:\n{combined_output}"
-        )
-
-        # Verify DNS auto-fix was applied and mentions localhost
-        assert (
-            "Detected DNS misconfiguration" in combined_output
-            or "DNS configuration fixed" in combined_output
-        ), f"Build should show DNS auto-fix message. Output:\n{combined_output}"
-
-        # Verify the specific localhost DNS detection message
-        assert "localhost" in combined_output.lower() or "127.0.0" in combined_output, (
-            f"Build should mention localhost DNS issue. Output:\n{combined_output}"
-        )
-
-        # Verify the build script's DNS check passed
-        assert "DNS resolution works!" in combined_output, (
-            f"DNS should work after auto-fix. Output:\n{combined_output}"
-        )
-
-    finally:
-        # Always restore DNS configuration
-        restore_dns_config(network_name)
-
-        # Cleanup test image
-        subprocess.run(
-            [coi_binary, "image", "delete", image_name],
-            capture_output=True,
-            timeout=30,
-            check=False,
-        )
+    # Minimal build script that verifies DNS works
+    build_script = os.path.join(BUILD_SCRIPTS_DIR, "dns_check_localhost.sh")
+
+    # Keep other workers off the network DNS config while it is broken
+    with file_lock(DNS_NETWORK_LOCK):
+        try:
+            # Break DNS configuration with 127.0.0.1 (localhost)
+            if not break_dns_config(network_name, "127.0.0.1"):
+                pytest.skip("Could not modify Incus network configuration (permission denied?)")
+
+            # Clean up any existing build container
+            fast_run(
+                ["incus", "delete", "--force", "coi-build"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=scaled_timeout(30),
+                check=False,
+            )
+
+            # Build custom image from fresh Ubuntu base (not coi) to trigger DNS fix.
+            # The image itself is never used, so stop the build once the fix and
+            # the script's DNS check are both visible instead of waiting for publish.
+            returncode, combined_output = asyncio.run(
+                run_until_marker(
+                    [
+                        coi_binary,
+                        "build",
+                        "custom",
+                        image_name,
+                        "--base",
+                        ubuntu_base_image,
+                        "--script",
+                        build_script,
+                        "--log-format",
+                        "json",
+                        "--network",
+                        network_name,
+                    ],
+                    [DNS_AUTOFIX_EVENT_MARKER, "DNS resolution works!"],
+                    timeout=scaled_timeout(600),  # Longer timeout for DNS fix + build
+                )
+            )
+
+            # Build should get through the script despite broken DNS
+            # (returncode is None when it was stopped early after the markers)
+            assert returncode in (None, 0), (
+                f"Build should succeed with DNS auto-fix for localhost DNS. "
+                f"Exit code: {returncode}\n"
+                f"Output:\n{combined_output}"
+            )
+
+            # Verify DNS auto-fix was applied and mentions localhost
+            dns_fix = next(
+                (e for e in build_events(combined_output) if e["event"] == "dns_autofix"),
+                None,
+            )
+            assert dns_fix is not None, (
+                f"Build should report a dns_autofix event. Output:\n{combined_output}"
+            )
+
+            # Verify the specific localhost DNS detection reason
+            assert DNS_LOCALHOST_RE.search(dns_fix.get("reason", "")), (
+                f"DNS auto-fix should mention localhost DNS issue. Event: {dns_fix}"
+            )
+
+            # Verify the build script's DNS check passed
+            assert "DNS resolution works!" in combined_output, (
+                f"DNS should work after auto-fix. Output:\n{combined_output}"
+            )
+
+        finally:
+            # Always restore DNS configuration and cleanup the test image and any
+            # build container left behind by stopping the build early (run concurrently)
+            run_batch(
+                [
+                    restore_dns_command(network_name),
+                    ["incus", "delete", "--force", "coi-build"],
+                    [coi_binary, "image", "delete", image_name],
+                ],
+                parallel=True,
+            )
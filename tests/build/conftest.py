@@ -0,0 +1,106 @@
+"""
+Pytest fixtures for build tests.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from support.helpers import coi_image_exists, fast_run, file_lock, scaled_timeout
+from support.incus_client import IncusClientError, shared_client
+
+# Plain Ubuntu image for builds that must not start from the coi image,
+# and the local alias it is cached under
+UBUNTU_BASE_REMOTE = "images:ubuntu/22.04"
+UBUNTU_BASE_ALIAS = "coi-test-ubuntu-22.04"
+
+
+@pytest.fixture(autouse=True)
+def serialize_builds():
+    """Run build tests one at a time across pytest-xdist workers.
+
+    Every `coi build` uses the fixed "coi-build" container, and the DNS
+    tests also reconfigure the shared Incus network, so build tests must
+    not overlap with each other or with another worker's image build.
+    """
+    with file_lock("coi-build"):
+        yield
+
+
+@pytest.fixture(scope="session")
+def ubuntu_base_image(coi_binary):
+    """Return a local alias for the plain Ubuntu base used by DNS build tests.
+
+    Copies images:ubuntu/22.04 into the local image store once, so builds
+    launch from a local alias instead of going through the remote on every
+    test. The alias is kept after the session as a cache for later runs.
+    Falls back to the remote image if the copy fails (e.g. no network).
+    """
+    with file_lock("coi-test-ubuntu-base"):
+        if coi_image_exists(coi_binary, UBUNTU_BASE_ALIAS):
+            return UBUNTU_BASE_ALIAS
+
+        result = fast_run(
+            ["incus", "image", "copy", UBUNTU_BASE_REMOTE, "local:", "--alias", UBUNTU_BASE_ALIAS],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=scaled_timeout(600),
+            check=False,
+        )
+
+    if result.returncode != 0:
+        return UBUNTU_BASE_REMOTE
+    return UBUNTU_BASE_ALIAS
+
+
+@pytest.fixture(scope="session")
+def dns_test_network():
+    """Create a bridge network for the DNS build tests to break and repair.
+
+    The DNS tests push broken resolvers through the network's DHCP config.
+    Doing that on the default bridge would break DNS for every other test
+    running at the same time, so they get their own bridge (one per xdist
+    worker), deleted at the end of the session. There is deliberately no
+    fallback to the default bridge: if the network can't be created (e.g.
+    no permission), the DNS-breaking tests skip instead.
+
+    Yields:
+        Network name, or None if the network could not be created
+    """
+    # Bridge interface names are limited to 15 characters
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    network_name = f"coi-dns-{worker}"[:15]
+
+    result = fast_run(
+        [
+            "incus",
+            "network",
+            "create",
+            network_name,
+            "ipv4.address=auto",
+            "ipv4.nat=true",
+            "ipv6.address=none",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(60),
+        check=False,
+    )
+    if result.returncode != 0:
+        # Reuse a bridge left behind by an aborted run, if there is one
+        try:
+            shared_client().network(network_name)
+        except IncusClientError:
+            yield None
+            return
+
+    yield network_name
+
+    fast_run(
+        ["incus", "network", "delete", network_name],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(60),
+        check=False,
+    )
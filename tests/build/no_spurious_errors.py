@@ -14,7 +14,7 @@ function trying to stop an already-stopped container.
 import subprocess
 
 
-def test_build_no_spurious_errors(coi_binary, tmp_path):
+def test_build_no_spurious_errors(coi_binary, coi_base_image_exists, tmp_path):
     """
     Test that successful builds don't show spurious error messages.
 
@@ -37,11 +37,7 @@ echo "Test build - no spurious errors"
     )
 
     # Skip if base doesn't exist
-    result = subprocess.run(
-        [coi_binary, "image", "exists", "coi"],
-        capture_output=True,
-    )
-    if result.returncode != 0:
+    if not coi_base_image_exists:
         # Skip test if coi base image doesn't exist
         return
 
@@ -11,6 +11,7 @@ Tests that:
 import subprocess
 import time
 
+import pytest
 from pexpect import EOF, TIMEOUT
 
 from support.helpers import (
@@ -18,6 +19,7 @@ from support.helpers import (
     get_container_list,
     send_prompt,
     spawn_coi,
+    wait_container_stopped,
     wait_for_container_ready,
     wait_for_prompt,
     wait_for_text_in_monitor,
@@ -25,6 +27,7 @@ from support.helpers import (
 )
 
 
+@pytest.mark.serial
 def test_clean_all_removes_everything(coi_binary, cleanup_containers, workspace_dir):
     """
     Test that coi clean --all removes containers and sessions.
@@ -95,7 +98,7 @@ def test_clean_all_removes_everything(coi_binary, cleanup_containers, workspace_
         timeout=60,
     )
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name_2), "Container should stop"
 
     # === Phase 3: Clean all ===
 
@@ -8,7 +8,10 @@ Tests that:
 
 import subprocess
 
+import pytest
 
+
+@pytest.mark.serial
 def test_clean_force_skips_confirmation(coi_binary, cleanup_containers):
     """
     Test that coi clean --force skips confirmation prompt.
@@ -10,12 +10,15 @@ Tests that:
 import subprocess
 import time
 
+import pytest
+
 from support.helpers import (
     calculate_container_name,
     get_container_list,
 )
 
 
+@pytest.mark.serial
 def test_clean_keeps_running(coi_binary, cleanup_containers, workspace_dir):
     """
     Test that coi clean does NOT remove running containers.
@@ -8,7 +8,10 @@ Tests that:
 
 import subprocess
 
+import pytest
 
+
+@pytest.mark.serial
 def test_clean_no_stopped_containers(coi_binary, cleanup_containers):
     """
     Test that coi clean with no stopped containers shows appropriate message.
@@ -11,12 +11,16 @@ Tests that:
 import subprocess
 import time
 
+import pytest
+
 from support.helpers import (
     calculate_container_name,
     get_container_list,
+    wait_container_stopped,
 )
 
 
+@pytest.mark.serial
 def test_clean_removes_stopped(coi_binary, cleanup_containers, workspace_dir):
     """
     Test that coi clean removes stopped containers.
@@ -57,7 +61,7 @@ def test_clean_removes_stopped(coi_binary, cleanup_containers, workspace_dir):
 
     assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # === Phase 3: Clean ===
 
@@ -10,6 +10,7 @@ Tests that:
 import subprocess
 import time
 
+import pytest
 from pexpect import EOF, TIMEOUT
 
 from support.helpers import (
@@ -23,6 +24,7 @@ from support.helpers import (
 )
 
 
+@pytest.mark.serial
 def test_clean_sessions_flag(coi_binary, cleanup_containers, workspace_dir):
     """
     Test that coi clean --sessions cleans saved session data.
@@ -30,6 +30,19 @@ def coi_binary():
     return os.path.abspath(binary_path)
 
 
+@pytest.fixture(scope="session")
+def coi_help_result(coi_binary):
+    """Run `coi --help` once and share the result.
+
+    Help output is fixed for a given binary, so tests that only make
+    string assertions about it inspect one invocation.
+
+    Returns:
+        CompletedProcess with text stdout/stderr
+    """
+    return subprocess.run([coi_binary, "--help"], capture_output=True, text=True, timeout=5)
+
+
 @pytest.fixture
 def workspace_dir(tmp_path):
     """Provide an isolated temporary workspace directory for each test."""
@@ -43,7 +56,7 @@ def workspace_dir(tmp_path):
 def cleanup_containers(workspace_dir, coi_binary):
     """Cleanup test containers and associated network resources after each test."""
     # Import here to avoid circular imports
-    from support.helpers import calculate_container_name, get_container_list
+    from support.helpers import calculate_container_name, get_container_list, run_batch
 
     yield
 
@@ -52,27 +65,17 @@ def cleanup_containers(workspace_dir, coi_binary):
     for slot in range(1, 11):
         workspace_containers.add(calculate_container_name(workspace_dir, slot))
 
-    # Get all running containers and delete any that belong to this test's workspace
-    containers = get_container_list()
-    for container in containers:
-        if container in workspace_containers:
-            # Delete the container
-            # Note: ACLs are already cleaned up by coi shell cleanup when it exits
-            subprocess.run(
-                [coi_binary, "container", "delete", container, "--force"],
-                capture_output=True,
-                timeout=30,
-                check=False,
-            )
-
-    # Kill any orphaned tmux sessions to prevent test pollution
-    # This ensures clean state between tests, especially after tmux command tests
-    subprocess.run(
-        ["tmux", "kill-server"],
-        capture_output=True,
-        timeout=5,
-        check=False,
-    )
+    # Delete any running containers that belong to this test's workspace, and
+    # kill any orphaned tmux sessions to prevent test pollution (this ensures
+    # clean state between tests, especially after tmux command tests).
+    # The commands are independent, so they run concurrently.
+    # Note: ACLs are already cleaned up by coi shell cleanup when it exits
+    commands = [
+        [coi_binary, "container", "delete", container, "--force"]
+        for container in sorted(get_container_list() & workspace_containers)
+    ]
+    commands.append(["tmux", "kill-server"])
+    run_batch(commands, parallel=True)
 
 
 @pytest.fixture(scope="session")
@@ -89,6 +92,18 @@ def dummy_path():
     return os.path.abspath(dummy_dir)
 
 
+@pytest.fixture(scope="session")
+def coi_base_image_exists(coi_binary):
+    """Return True if the coi base image is available.
+
+    Several tests build on top of the coi image and skip without it; the
+    answer doesn't change during a session, so it is looked up once.
+    """
+    from support.helpers import coi_image_exists
+
+    return coi_image_exists(coi_binary, "coi")
+
+
 @pytest.fixture(scope="session")
 def dummy_image(coi_binary):
     """Build and return a test image with dummy pre-installed.
@@ -98,12 +113,12 @@ def dummy_image(coi_binary):
 
     The image is built once per test session and reused across all tests.
     """
+    from support.helpers import coi_image_exists, file_lock
+
     image_name = "coi-test-dummy"
 
     # Check if image already exists
-    result = subprocess.run([coi_binary, "image", "exists", image_name], capture_output=True)
-
-    if result.returncode == 0:
+    if coi_image_exists(coi_binary, image_name):
         return image_name  # Already built
 
     # Build image with dummy
@@ -112,14 +127,20 @@ def dummy_image(coi_binary):
     if not os.path.exists(script_path):
         pytest.skip(f"Dummy install script not found: {script_path}")
 
-    print("\nBuilding test image with dummy (one-time setup)...")
+    # Builds share the "coi-build" container, so only one worker may build at
+    # a time; another worker may have built the image while we waited
+    with file_lock("coi-build"):
+        if coi_image_exists(coi_binary, image_name):
+            return image_name
+
+        print("\nBuilding test image with dummy (one-time setup)...")
 
-    result = subprocess.run(
-        [coi_binary, "build", "custom", image_name, "--script", script_path],
-        capture_output=True,
-        text=True,
-        timeout=300,
-    )
+        result = subprocess.run(
+            [coi_binary, "build", "custom", image_name, "--script", script_path],
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
 
     if result.returncode != 0:
         pytest.skip(f"Could not build dummy image: {result.stderr}")
@@ -128,6 +149,36 @@ def dummy_image(coi_binary):
     return image_name
 
 
+@pytest.fixture(scope="session")
+def incus_client():
+    """Return a persistent Incus API client shared by the whole session.
+
+    Read-only queries go over the Incus unix socket instead of spawning the
+    incus CLI for every call.
+    """
+    from support.incus_client import shared_client
+
+    return shared_client()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked serial when running inside a pytest-xdist worker.
+
+    Serial tests act on every container on the host (e.g. kill --all), so
+    they would tear down other workers' containers mid-test, as well as the
+    containers shared by session-scoped fixtures. Every run (make
+    integrations*, the CI groups) excludes them with -m "not serial" and
+    runs them afterwards in a pytest session of their own.
+    """
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        return
+
+    skip_serial = pytest.mark.skip(reason="changes global container state; run without -n")
+    for item in items:
+        if "serial" in item.keywords:
+            item.add_marker(skip_serial)
+
+
 # Hook to show test duration inline with each test result
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -0,0 +1,45 @@
+"""
+Pytest fixtures for container tests.
+"""
+
+import subprocess
+
+import pytest
+
+from support.helpers import calculate_container_name, scaled_timeout, wait_container_ready
+
+
+@pytest.fixture(scope="session")
+def shared_exec_container(coi_binary, tmp_path_factory):
+    """Launch one container shared by the read-only exec tests.
+
+    The exec --cwd/--env/--user tests only run commands that don't change
+    the container, so they reuse a single launch instead of paying for one
+    each. The container is deleted at the end of the session.
+
+    Yields:
+        Name of the running container
+    """
+    workspace = tmp_path_factory.mktemp("exec") / "workspace"
+    workspace.mkdir()
+    container_name = calculate_container_name(str(workspace), 1)
+
+    result = subprocess.run(
+        [coi_binary, "container", "launch", "coi", container_name],
+        capture_output=True,
+        text=True,
+        timeout=scaled_timeout(120),
+    )
+
+    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
+
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
+
+    yield container_name
+
+    subprocess.run(
+        [coi_binary, "container", "delete", container_name, "--force"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
+    )
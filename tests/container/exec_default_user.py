@@ -8,9 +8,8 @@ Tests that:
 """
 
 import subprocess
-import time
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_ready
 
 
 def test_code_user_exists(coi_binary, cleanup_containers, workspace_dir):
@@ -35,7 +34,7 @@ def test_code_user_exists(coi_binary, cleanup_containers, workspace_dir):
     )
     assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
 
-    time.sleep(3)
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
 
     # === Phase 2: Verify code user exists with UID 1000 ===
 
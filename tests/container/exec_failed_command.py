@@ -8,10 +8,10 @@ Tests that:
 """
 
 import subprocess
-import time
 
 from support.helpers import (
     calculate_container_name,
+    wait_container_ready,
 )
 
 
@@ -38,7 +38,7 @@ def test_exec_failed_command(coi_binary, cleanup_containers, workspace_dir):
 
     assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
 
-    time.sleep(3)
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
 
     # === Phase 2: Execute failing command ===
 
@@ -13,6 +13,7 @@ import time
 
 from support.helpers import (
     calculate_container_name,
+    wait_container_ready,
 )
 
 
@@ -40,7 +41,7 @@ def test_exec_poweroff_without_sudo(coi_binary, cleanup_containers, workspace_di
 
     assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
 
-    time.sleep(3)
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
 
     # === Phase 2: Execute sudo poweroff (no password required) ===
 
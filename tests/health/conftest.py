@@ -0,0 +1,59 @@
+"""
+Pytest fixtures for health tests.
+"""
+
+import subprocess
+
+import pytest
+
+from support.helpers import run_concurrently, scaled_timeout
+
+
+@pytest.fixture(scope="session")
+def health_json_result(coi_binary):
+    """Run `coi health --format json` once and share the result.
+
+    A health run probes the network, image and permissions and takes
+    several seconds; its output does not change within a test session,
+    so the JSON tests inspect one invocation instead of running their own.
+
+    Returns:
+        CompletedProcess with bytes stdout/stderr (the JSON parsers take
+        bytes directly, so the output is never decoded as a whole)
+    """
+    return subprocess.run(
+        [coi_binary, "health", "--format", "json"],
+        capture_output=True,
+        timeout=scaled_timeout(30),
+    )
+
+
+@pytest.fixture(scope="session")
+def health_text_results(coi_binary):
+    """Run `coi health` and `coi health --verbose` concurrently, once.
+
+    The two runs are independent, so starting them together costs the
+    time of the slower one instead of both back to back.
+
+    Returns:
+        (default, verbose) tuple of CompletedProcess with bytes stdout/stderr,
+        since the tests only search the output for ASCII markers
+    """
+    default, verbose = run_concurrently(
+        [[coi_binary, "health"], [coi_binary, "health", "--verbose"]],
+        timeout=scaled_timeout(30),
+        text=False,
+    )
+    return default, verbose
+
+
+@pytest.fixture(scope="session")
+def health_output(health_text_results):
+    """Result of the session's single `coi health` run."""
+    return health_text_results[0]
+
+
+@pytest.fixture(scope="session")
+def health_verbose_output(health_text_results):
+    """Result of the session's single `coi health --verbose` run."""
+    return health_text_results[1]
@@ -10,28 +10,22 @@ Note: We can only test the healthy case reliably in CI since we expect
 the environment to be properly configured.
 """
 
-import json
-import subprocess
+from support.helpers import loads_json
 
 
-def test_health_exit_code_matches_status(coi_binary):
+def test_health_exit_code_matches_status(health_json_result):
     """
     Test that exit code matches reported status.
 
     Flow:
-    1. Run coi health --format json
+    1. Take the shared coi health --format json result
     2. Parse the status field
     3. Verify exit code matches status
     """
-    result = subprocess.run(
-        [coi_binary, "health", "--format", "json"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+    result = health_json_result
 
     # Parse JSON to get status
-    data = json.loads(result.stdout)
+    data = loads_json(result.stdout)
     status = data["status"]
 
     # Map status to expected exit code
@@ -48,23 +42,18 @@ def test_health_exit_code_matches_status(coi_binary):
     )
 
 
-def test_health_summary_matches_checks(coi_binary):
+def test_health_summary_matches_checks(health_json_result):
     """
     Test that summary counts match actual check results.
 
     Flow:
-    1. Run coi health --format json
+    1. Take the shared coi health --format json result
     2. Count checks by status
     3. Verify summary matches counts
     """
-    result = subprocess.run(
-        [coi_binary, "health", "--format", "json"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+    result = health_json_result
 
-    data = json.loads(result.stdout)
+    data = loads_json(result.stdout)
     checks = data["checks"]
     summary = data["summary"]
 
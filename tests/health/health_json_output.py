@@ -8,35 +8,34 @@ Tests that:
 """
 
 import json
-import subprocess
 
+from support.helpers import loads_json
 
-def test_health_json_output(coi_binary):
+
+def test_health_json_output(health_json_result):
     """
     Test health command with JSON output format.
 
     Flow:
-    1. Run coi health --format json
+    1. Take the shared coi health --format json result
     2. Verify output is valid JSON
     3. Verify structure contains required fields
     """
-    result = subprocess.run(
-        [coi_binary, "health", "--format", "json"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+    result = health_json_result
 
     # Should succeed (exit 0 for healthy, 1 for degraded)
     assert result.returncode in [0, 1], (
-        f"Health check failed with exit {result.returncode}. stderr: {result.stderr}"
+        f"Health check failed with exit {result.returncode}. "
+        f"stderr: {result.stderr.decode(errors='replace')}"
     )
 
     # Parse JSON
     try:
-        data = json.loads(result.stdout)
+        data = loads_json(result.stdout)
     except json.JSONDecodeError as e:
-        raise AssertionError(f"Output is not valid JSON: {e}\nOutput: {result.stdout}")
+        raise AssertionError(
+            f"Output is not valid JSON: {e}\nOutput: {result.stdout.decode(errors='replace')}"
+        )
 
     # Verify top-level structure
     assert "status" in data, "Should have 'status' field"
@@ -7,10 +7,8 @@ Tests that:
 3. Exit code is 0 when healthy
 """
 
-import subprocess
 
-
-def test_health_text_output(coi_binary):
+def test_health_text_output(health_output):
     """
     Test health command with default text output.
 
@@ -19,36 +17,32 @@ def test_health_text_output(coi_binary):
     2. Verify expected sections appear in output
     3. Verify exit code is 0
     """
-    result = subprocess.run(
-        [coi_binary, "health"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+    result = health_output
 
     # Should succeed (exit 0 for healthy, 1 for degraded)
     assert result.returncode in [0, 1], (
-        f"Health check failed with exit {result.returncode}. stderr: {result.stderr}"
+        f"Health check failed with exit {result.returncode}. "
+        f"stderr: {result.stderr.decode(errors='replace')}"
     )
 
     output = result.stdout
 
     # Verify header
-    assert "Code on Incus Health Check" in output, "Should have header"
+    assert b"Code on Incus Health Check" in output, "Should have header"
 
     # Verify key sections exist
-    assert "SYSTEM:" in output, "Should have SYSTEM section"
-    assert "CRITICAL:" in output, "Should have CRITICAL section"
-    assert "NETWORKING:" in output, "Should have NETWORKING section"
-    assert "STORAGE:" in output, "Should have STORAGE section"
-    assert "CONFIGURATION:" in output, "Should have CONFIGURATION section"
-    assert "STATUS:" in output, "Should have STATUS section"
+    assert b"SYSTEM:" in output, "Should have SYSTEM section"
+    assert b"CRITICAL:" in output, "Should have CRITICAL section"
+    assert b"NETWORKING:" in output, "Should have NETWORKING section"
+    assert b"STORAGE:" in output, "Should have STORAGE section"
+    assert b"CONFIGURATION:" in output, "Should have CONFIGURATION section"
+    assert b"STATUS:" in output, "Should have STATUS section"
 
     # Verify key checks appear
-    assert "Incus" in output, "Should check Incus"
-    assert "Operating system" in output, "Should show OS info"
-    assert "Network bridge" in output, "Should check network bridge"
-    assert "Disk space" in output, "Should check disk space"
+    assert b"Incus" in output, "Should check Incus"
+    assert b"Operating system" in output, "Should show OS info"
+    assert b"Network bridge" in output, "Should check network bridge"
+    assert b"Disk space" in output, "Should check disk space"
 
     # Verify summary line
-    assert "checks passed" in output or "checks failed" in output, "Should have summary"
+    assert b"checks passed" in output or b"checks failed" in output, "Should have summary"
@@ -7,10 +7,8 @@ Tests that:
 3. Passwordless sudo check is included
 """
 
-import subprocess
 
-
-def test_health_verbose_output(coi_binary):
+def test_health_verbose_output(health_verbose_output):
     """
     Test health command with verbose flag.
 
@@ -19,27 +17,23 @@ def test_health_verbose_output(coi_binary):
     2. Verify additional checks appear (DNS, sudo)
     3. Verify OPTIONAL section exists
     """
-    result = subprocess.run(
-        [coi_binary, "health", "--verbose"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+    result = health_verbose_output
 
     # Should succeed (exit 0 for healthy, 1 for degraded)
     assert result.returncode in [0, 1], (
-        f"Health check failed with exit {result.returncode}. stderr: {result.stderr}"
+        f"Health check failed with exit {result.returncode}. "
+        f"stderr: {result.stderr.decode(errors='replace')}"
     )
 
     output = result.stdout
 
     # Verify OPTIONAL section exists with verbose
-    assert "OPTIONAL:" in output, "Verbose should include OPTIONAL section"
+    assert b"OPTIONAL:" in output, "Verbose should include OPTIONAL section"
 
     # Verify DNS check appears
-    assert "DNS resolution" in output, "Verbose should check DNS resolution"
+    assert b"DNS resolution" in output, "Verbose should check DNS resolution"
 
     # Verify passwordless sudo check appears
-    assert "Passwordless sudo" in output or "sudo" in output.lower(), (
+    assert b"Passwordless sudo" in output or b"sudo" in output.lower(), (
         "Verbose should check passwordless sudo"
     )
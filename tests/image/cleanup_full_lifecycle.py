@@ -10,7 +10,7 @@ Tests that:
 import subprocess
 import time
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_stopped
 
 
 def test_cleanup_keeps_recent_versions(coi_binary, cleanup_containers, workspace_dir):
@@ -48,7 +48,7 @@ def test_cleanup_keeps_recent_versions(coi_binary, cleanup_containers, workspace
     )
     assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # === Phase 2: Create 3 versioned images ===
 
@@ -12,7 +12,7 @@ Tests that:
 import subprocess
 import time
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_stopped
 
 
 def test_publish_and_delete_image(coi_binary, cleanup_containers, workspace_dir):
@@ -53,7 +53,7 @@ def test_publish_and_delete_image(coi_binary, cleanup_containers, workspace_dir)
     )
     assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # === Phase 3: Publish as image ===
 
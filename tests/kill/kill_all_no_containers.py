@@ -8,7 +8,10 @@ Tests that:
 
 import subprocess
 
+import pytest
 
+
+@pytest.mark.serial
 def test_kill_all_no_containers(coi_binary, cleanup_containers):
     """
     Test coi kill --all when no containers exist.
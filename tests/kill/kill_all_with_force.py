@@ -10,9 +10,12 @@ Tests that:
 import subprocess
 import time
 
+import pytest
+
 from support.helpers import calculate_container_name
 
 
+@pytest.mark.serial
 def test_kill_all_with_force(coi_binary, cleanup_containers, workspace_dir):
     """
     Test killing all containers with --all --force.
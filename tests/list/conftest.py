@@ -0,0 +1,91 @@
+"""
+Pytest fixtures for list tests.
+"""
+
+import pytest
+
+from support.helpers import (
+    ShellSession,
+    calculate_container_name,
+    loads_json,
+    poll_until,
+    scaled_timeout,
+)
+
+
+@pytest.fixture(scope="package")
+def coi_shell():
+    """Provide one host bash shared by the list tests.
+
+    The IPv4 tests launch, stop, list and delete a container in sequence;
+    sending those coi calls through a single shell saves a process spawn
+    per step. stderr is merged into each result's stdout.
+    """
+    shell = ShellSession()
+    yield shell
+    shell.close()
+
+
+def _list_entry(coi_binary, coi_shell, container_name):
+    """Return the container's `coi list --format=json` entry, or None."""
+    result = coi_shell.run_args([coi_binary, "list", "--format=json"], timeout=30)
+    if result.returncode != 0:
+        return None
+    by_name = {c["name"]: c for c in loads_json(result.stdout)["active_containers"]}
+    return by_name.get(container_name)
+
+
+def _launch_list_container(coi_binary, coi_shell, tmp_path_factory, slot):
+    workspace = tmp_path_factory.mktemp("list-ipv4") / "workspace"
+    workspace.mkdir()
+    container_name = calculate_container_name(str(workspace), slot)
+
+    result = coi_shell.run_args(
+        [coi_binary, "container", "launch", "coi", container_name], timeout=120
+    )
+    assert result.returncode == 0, f"Container launch should succeed. output: {result.stdout}"
+    return container_name
+
+
+@pytest.fixture(scope="package")
+def running_container(coi_binary, coi_shell, tmp_path_factory):
+    """Launch one running container shared by the IPv4 list tests.
+
+    The text and JSON list tests only read `coi list` output, so they can
+    inspect the same container instead of each launching their own.
+
+    Yields:
+        The container name
+    """
+    container_name = _launch_list_container(coi_binary, coi_shell, tmp_path_factory, 1)
+
+    # Poll instead of sleeping: the address usually shows up well before
+    # a fixed delay would expire
+    assert poll_until(
+        lambda: (_list_entry(coi_binary, coi_shell, container_name) or {}).get("ipv4"),
+        timeout=scaled_timeout(30),
+    ), f"Container {container_name} did not get an IPv4 address"
+    yield container_name
+    coi_shell.run_args([coi_binary, "container", "delete", container_name, "--force"], timeout=30)
+
+
+@pytest.fixture(scope="package")
+def stopped_container(coi_binary, coi_shell, tmp_path_factory):
+    """Launch and stop one container shared by the stopped-IPv4 list tests.
+
+    Yields:
+        The container name
+    """
+    container_name = _launch_list_container(coi_binary, coi_shell, tmp_path_factory, 1)
+
+    result = coi_shell.run_args([coi_binary, "container", "stop", container_name], timeout=60)
+    assert result.returncode == 0, f"Container stop should succeed. output: {result.stdout}"
+
+    assert poll_until(
+        lambda: (
+            (_list_entry(coi_binary, coi_shell, container_name) or {}).get("status") == "Stopped"
+        ),
+        timeout=scaled_timeout(30),
+    ), f"Container {container_name} is not listed as stopped"
+    yield container_name
+    coi_shell.run_args([coi_binary, "container", "delete", container_name, "--force"], timeout=30)
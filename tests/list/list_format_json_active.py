@@ -1,9 +1,8 @@
 """Test coi list --format=json with active containers"""
 
-import json
 import subprocess
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, loads_json
 
 
 def test_list_format_json_active(coi_binary, cleanup_containers, workspace_dir):
@@ -23,13 +22,12 @@ def test_list_format_json_active(coi_binary, cleanup_containers, workspace_dir):
     result = subprocess.run(
         [coi_binary, "list", "--format=json"],
         capture_output=True,
-        text=True,
         timeout=30,
     )
-    assert result.returncode == 0, f"List failed: {result.stderr}"
+    assert result.returncode == 0, f"List failed: {result.stderr.decode(errors='replace')}"
 
     # Phase 3: Parse and verify JSON
-    data = json.loads(result.stdout)
+    data = loads_json(result.stdout)
 
     # Verify structure
     assert "active_containers" in data, "Missing 'active_containers' key"
@@ -37,11 +35,8 @@ def test_list_format_json_active(coi_binary, cleanup_containers, workspace_dir):
     assert len(data["active_containers"]) > 0, "Should have at least one container"
 
     # Find our container
-    container = None
-    for c in data["active_containers"]:
-        if c["name"] == container_name:
-            container = c
-            break
+    by_name = {c["name"]: c for c in data["active_containers"]}
+    container = by_name.get(container_name)
 
     assert container is not None, f"Container {container_name} not found in output"
 
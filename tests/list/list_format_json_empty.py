@@ -1,34 +1,34 @@
 """Test coi list --format=json with no containers"""
 
-import json
 import subprocess
 
+from support.helpers import calculate_container_name, loads_json
 
-def test_list_format_json_empty(coi_binary, cleanup_containers):
-    """Test that coi list --format=json outputs valid JSON with no containers."""
-    # cleanup_containers fixture ensures all test containers are cleaned up
 
-    # First, forcefully clean ALL containers to ensure truly empty state
-    subprocess.run(
-        [coi_binary, "kill", "--all", "--force"],
-        capture_output=True,
-        timeout=30,
-        check=False,
-    )
+def test_list_format_json_empty(coi_binary, workspace_dir, cleanup_containers):
+    """Test that coi list --format=json outputs valid JSON with no containers.
 
-    # Run list with JSON format (no containers running)
+    Containers of other tests (e.g. the shared list fixtures) may be running,
+    so rather than killing everything this checks that none of this test's
+    own workspace containers are listed.
+    """
+    # Run list with JSON format (no containers running for this workspace)
     result = subprocess.run(
         [coi_binary, "list", "--format=json"],
         capture_output=True,
-        text=True,
         timeout=30,
     )
-    assert result.returncode == 0, f"List failed: {result.stderr}"
+    assert result.returncode == 0, f"List failed: {result.stderr.decode(errors='replace')}"
 
     # Parse and verify JSON
-    data = json.loads(result.stdout)
+    data = loads_json(result.stdout)
 
     # Verify structure
     assert "active_containers" in data, "Missing 'active_containers' key"
     assert isinstance(data["active_containers"], list), "active_containers should be a list"
-    assert len(data["active_containers"]) == 0, "Should have no containers when none are running"
+
+    workspace_containers = {calculate_container_name(workspace_dir, slot) for slot in range(1, 11)}
+    listed = {c["name"] for c in data["active_containers"]}
+    assert not listed & workspace_containers, (
+        f"Should have no containers for this workspace, got: {sorted(listed & workspace_containers)}"
+    )
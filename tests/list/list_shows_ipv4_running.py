@@ -7,49 +7,26 @@ Tests that:
 3. Verify it shows the container's IPv4 address
 """
 
-import subprocess
-import time
 
-from support.helpers import calculate_container_name
-
-
-def test_list_shows_ipv4_running(coi_binary, cleanup_containers, workspace_dir):
+def test_list_shows_ipv4_running(coi_binary, coi_shell, running_container):
     """
     Test that coi list shows IPv4 address for running containers.
 
     Flow:
-    1. Launch a container
+    1. Take the shared running container
     2. Run coi list
     3. Verify container appears with IPv4 address
-    4. Cleanup
     """
-    container_name = calculate_container_name(workspace_dir, 1)
-
-    # === Phase 1: Launch container ===
-
-    result = subprocess.run(
-        [coi_binary, "container", "launch", "coi", container_name],
-        capture_output=True,
-        text=True,
-        timeout=120,
-    )
-    assert result.returncode == 0, f"Container launch should succeed. stderr: {result.stderr}"
+    container_name = running_container
 
-    time.sleep(3)
+    # === Phase 1: Run list ===
 
-    # === Phase 2: Run list ===
-
-    result = subprocess.run(
-        [coi_binary, "list"],
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
-    assert result.returncode == 0, f"List should succeed. stderr: {result.stderr}"
+    result = coi_shell.run_args([coi_binary, "list"], timeout=30)
+    assert result.returncode == 0, f"List should succeed. output: {result.stdout}"
 
     output = result.stdout
 
-    # === Phase 3: Verify IPv4 appears ===
+    # === Phase 2: Verify IPv4 appears ===
 
     assert container_name in output, (
         f"Container {container_name} should appear in list. Got:\n{output}"
@@ -71,11 +48,3 @@ def test_list_shows_ipv4_running(coi_binary, cleanup_containers, workspace_dir):
                 break
 
     assert found_ipv4, f"Should show an IPv4 address for running container. Got:\n{output}"
-
-    # === Phase 4: Cleanup ===
-
-    subprocess.run(
-        [coi_binary, "container", "delete", container_name, "--force"],
-        capture_output=True,
-        timeout=30,
-    )
@@ -11,7 +11,7 @@ Tests that:
 import subprocess
 import time
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_stopped
 
 
 def test_list_stopped_container(coi_binary, cleanup_containers, workspace_dir):
@@ -49,7 +49,7 @@ def test_list_stopped_container(coi_binary, cleanup_containers, workspace_dir):
     )
     assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # === Phase 3: Run list ===
 
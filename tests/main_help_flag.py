@@ -6,12 +6,10 @@ Expected:
 - Exit code is 0
 """
 
-import subprocess
 
-
-def test_main_help_flag(coi_binary):
+def test_main_help_flag(coi_help_result):
     """Test that coi --help displays help text."""
-    result = subprocess.run([coi_binary, "--help"], capture_output=True, text=True, timeout=5)
+    result = coi_help_result
 
     assert result.returncode == 0, f"Expected exit code 0, got {result.returncode}"
     assert "code-on-incus" in result.stdout.lower()
@@ -8,9 +8,10 @@ Expected:
 import subprocess
 
 
-def test_main_help_shorthand(coi_binary):
+def test_main_help_shorthand(coi_binary, coi_help_result):
     """Test that coi -h works as shorthand for --help."""
     result = subprocess.run([coi_binary, "-h"], capture_output=True, text=True, timeout=5)
 
     assert result.returncode == 0
     assert "code-on-incus" in result.stdout.lower()
+    assert result.stdout == coi_help_result.stdout, "-h should print the same help as --help"
@@ -0,0 +1,231 @@
+"""
+Pytest fixtures for meta (installation) tests.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from support.helpers import ContainerShell, coi_image_exists, file_lock
+
+# Checkout whose go.mod lists the modules the meta container's build needs
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Ubuntu release the installation smoke test runs on
+META_BASE_REMOTE = "images:ubuntu/24.04"
+
+# Go toolchain installed in the meta image. The tarball is downloaded once
+# on the host and pushed into the provisioning container.
+META_GO_VERSION = "1.21.13"
+META_GO_TARBALL = f"go{META_GO_VERSION}.linux-amd64.tar.gz"
+
+# Provisioning done once and cached as a local image: the README's system
+# dependencies and Go toolchain. Retries apt-get to ride out transient
+# network issues in CI.
+META_PROVISION_SCRIPT = """
+set -e
+# Wait for network and DNS to be ready: probe the HTTP port apt uses
+# (up to 30s)
+while [ "$SECONDS" -lt 30 ]; do
+    if timeout 1 bash -c 'echo > /dev/tcp/archive.ubuntu.com/80' 2>/dev/null; then
+        break
+    fi
+    sleep 0.2
+done
+
+# Install system dependencies (retry with backoff to handle transient network issues)
+for attempt in 1 2 3 4 5; do
+    if apt-get update -qq && DEBIAN_FRONTEND=noninteractive apt-get install -y -qq \\
+        curl wget git ca-certificates gnupg build-essential; then
+        break
+    fi
+    [ "$attempt" = 5 ] && exit 1
+    echo "apt-get attempt $attempt failed, retrying..."
+    sleep $((1 << (attempt - 1)))
+done
+echo "System dependencies installed"
+
+# Install Go (from the tarball pushed by the host, downloading it if absent)
+GO_TARBALL=/root/@GO_TARBALL@
+if [ ! -f "$GO_TARBALL" ]; then
+    wget -q -O "$GO_TARBALL" https://go.dev/dl/@GO_TARBALL@
+fi
+rm -rf /usr/local/go
+tar -C /usr/local -xzf "$GO_TARBALL"
+rm "$GO_TARBALL"
+echo 'export PATH=$PATH:/usr/local/go/bin' >> /root/.bashrc
+/usr/local/go/bin/go version
+
+# Leave a clean machine-id so containers launched from the image differ
+truncate -s 0 /etc/machine-id
+""".replace("@GO_TARBALL@", META_GO_TARBALL)
+
+# Image alias keyed on the provisioning script, so editing it rebuilds the image
+META_BASE_ALIAS = "coi-meta-base-" + hashlib.sha256(META_PROVISION_SCRIPT.encode()).hexdigest()[:8]
+
+
+def _incus(*args, timeout=180):
+    """Run an incus command, capturing text output."""
+    return subprocess.run(
+        ["incus", *args],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
+
+
+def _host_go_tarball():
+    """Return a host copy of the Go tarball, downloading it on first use.
+
+    Kept under ~/.cache/coi-tests so rebuilding the meta image doesn't
+    fetch ~70 MB again. Returns None if the download fails; provisioning
+    then falls back to downloading inside the container.
+    """
+    cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "coi-tests"
+    tarball = cache_dir / META_GO_TARBALL
+    if tarball.exists():
+        return tarball
+
+    partial = tarball.with_suffix(".partial")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        urllib.request.urlretrieve(f"https://go.dev/dl/{META_GO_TARBALL}", partial)
+        partial.rename(tarball)
+    except OSError:
+        partial.unlink(missing_ok=True)
+        return None
+    return tarball
+
+
+@pytest.fixture(scope="session")
+def meta_base_image(coi_binary):
+    """Return a local Ubuntu 24.04 image with build dependencies and Go installed.
+
+    Installing packages and Go dominates the installation smoke test, and
+    it doesn't exercise anything in this repository. The provisioned image
+    is published once and kept after the session as a cache for later
+    runs; the smoke test still clones and builds coi from scratch on it.
+    """
+    with file_lock("coi-meta-base"):
+        if coi_image_exists(coi_binary, META_BASE_ALIAS):
+            return META_BASE_ALIAS
+
+        builder = "coi-meta-provision"
+        _incus("delete", builder, "--force")
+
+        result = _incus("launch", META_BASE_REMOTE, builder)
+        if result.returncode != 0:
+            pytest.skip(f"Failed to launch meta container: {result.stderr}")
+
+        try:
+            go_tarball = _host_go_tarball()
+            if go_tarball is not None:
+                _incus("file", "push", str(go_tarball), f"{builder}/root/{META_GO_TARBALL}")
+
+            # Wait for container to be ready
+            time.sleep(10)
+
+            result = _incus("exec", builder, "--", "bash", "-c", META_PROVISION_SCRIPT, timeout=900)
+            assert result.returncode == 0, (
+                f"Failed to provision meta base image: {result.stderr}\n{result.stdout}"
+            )
+
+            result = _incus("publish", builder, "--force", "--alias", META_BASE_ALIAS, timeout=600)
+            assert result.returncode == 0, f"Failed to publish meta base image: {result.stderr}"
+        finally:
+            _incus("delete", builder, "--force")
+
+    return META_BASE_ALIAS
+
+
+@pytest.fixture(scope="session")
+def meta_container(meta_base_image):
+    """
+    Launch a provisioned Ubuntu container to test the installation process.
+
+    This validates that the README installation steps work correctly
+    and produce a functioning coi binary. Shared by both installation
+    tests for the whole session.
+    """
+    container_name = "coi-meta-test"
+
+    # Clean up any existing test container
+    _incus("delete", container_name, "--force")
+
+    # Launch from the provisioned Ubuntu 24.04 image
+    result = _incus("launch", meta_base_image, container_name)
+
+    if result.returncode != 0:
+        pytest.skip(f"Failed to launch meta container: {result.stderr}")
+
+    # Wait for container to be ready
+    time.sleep(10)
+
+    yield container_name
+
+    # Cleanup
+    _incus("delete", container_name, "--force")
+
+
+@pytest.fixture(scope="session")
+def meta_go_cache(meta_container, tmp_path_factory):
+    """Seed the meta container's Go module cache with this module's dependencies.
+
+    The smoke test builds coi from source inside the container, and the
+    first `go build` there downloads every module. `go mod download` on
+    the host fills a temporary GOMODCACHE with just the modules go.mod
+    needs (not the host's whole cache, which can be arbitrarily large),
+    and that is unpacked into the container. Does nothing if Go isn't
+    installed on the host or the download fails; the build then fetches
+    the modules itself.
+    """
+    go = shutil.which("go")
+    if go is None:
+        return
+
+    tar_dir = tmp_path_factory.mktemp("meta-go-cache")
+    mod_cache = tar_dir / "mod"
+    result = subprocess.run(
+        [go, "mod", "download"],
+        cwd=REPO_ROOT,
+        env={**os.environ, "GOMODCACHE": str(mod_cache), "GOFLAGS": "-modcacherw"},
+        capture_output=True,
+        timeout=300,
+    )
+    if result.returncode != 0:
+        return
+
+    tarball = tar_dir / "gomodcache.tgz"
+    result = subprocess.run(
+        ["tar", "czf", str(tarball), "-C", str(mod_cache), "."],
+        capture_output=True,
+        timeout=300,
+    )
+    if result.returncode != 0:
+        return
+    _incus("file", "push", str(tarball), f"{meta_container}/root/{tarball.name}")
+    _incus(
+        "exec",
+        meta_container,
+        "--",
+        "sh",
+        "-c",
+        f"mkdir -p /root/go/pkg/mod && tar -xzf /root/{tarball.name} -C /root/go/pkg/mod"
+        f" && rm /root/{tarball.name}",
+        timeout=300,
+    )
+
+
+@pytest.fixture(scope="session")
+def meta_shell(meta_container):
+    """Provide one persistent shell in the meta container for all test commands."""
+    shell = ContainerShell(meta_container)
+    yield shell
+    shell.close()
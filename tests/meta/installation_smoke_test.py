@@ -2,7 +2,8 @@
 Meta test for full installation process.
 
 This test acts as a smoke test for the entire installation workflow:
-1. Launch a fresh Ubuntu 24.04 container
+1. Launch an Ubuntu 24.04 container with build dependencies and Go
+   (provisioned once into a cached image by the meta_base_image fixture)
 2. Install Incus inside it (nested Incus)
 3. Follow the README installation steps
 4. Build the coi binary
@@ -16,148 +17,28 @@ Note: This test requires nested Incus support and takes longer to run.
 
 import os
 import subprocess
-import time
 
-import pytest
 
-
-@pytest.fixture(scope="module")
-def meta_container():
-    """
-    Launch a fresh Ubuntu container to test the installation process.
-
-    This validates that the README installation steps work correctly
-    and produce a functioning coi binary.
-    """
-    container_name = "coi-meta-test"
-
-    # Clean up any existing test container
-    subprocess.run(
-        ["incus", "delete", container_name, "--force"],
-        capture_output=True,
-        check=False,
-    )
-
-    # Launch fresh Ubuntu 24.04 container
-    result = subprocess.run(
-        [
-            "incus",
-            "launch",
-            "images:ubuntu/24.04",
-            container_name,
-        ],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
-
-    if result.returncode != 0:
-        pytest.skip(f"Failed to launch meta container: {result.stderr}")
-
-    # Wait for container to be ready
-    time.sleep(10)
-
-    yield container_name
-
-    # Cleanup
-    subprocess.run(
-        ["incus", "delete", container_name, "--force"],
-        capture_output=True,
-        check=False,
-    )
-
-
-def exec_in_container(container_name, command, timeout=300, check=True):
-    """Execute command in meta container and return result."""
-    result = subprocess.run(
-        ["incus", "exec", container_name, "--", "bash", "-c", command],
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        check=check,
-    )
-    return result
-
-
-def test_full_installation_process(meta_container, coi_binary):
+def test_full_installation_process(meta_shell, meta_go_cache, coi_binary):
     """
     Test the complete installation process from README.
 
     This is a smoke test that validates:
-    1. System dependencies can be installed
-    2. Go can be installed
-    3. Repository can be cloned
-    4. coi binary can be built from source
-    5. coi --help works
-    6. coi version works
+    1. System dependencies and Go are installed (meta_base_image fixture)
+    2. Repository can be cloned
+    3. coi binary can be built from source (Go module cache seeded from
+       the host by the meta_go_cache fixture)
+    4. coi --help works
+    5. coi version works
 
     This does NOT test Incus functionality - it only validates the
     build process and that the binary executes correctly.
     """
-    container_name = meta_container
-
-    # Phase 1: Install system dependencies
-    # Retry apt-get operations to handle transient network issues in CI
-    max_retries = 3
-    last_error = None
-
-    for attempt in range(max_retries):
-        result = exec_in_container(
-            container_name,
-            """
-            set -e
-            # Wait for network and DNS to be ready
-            for i in {1..30}; do
-                if ping -c 1 archive.ubuntu.com >/dev/null 2>&1; then
-                    break
-                fi
-                sleep 1
-            done
-
-            # Update package lists with retry
-            apt-get update -qq || sleep 5 && apt-get update -qq
-
-            # Install packages
-            DEBIAN_FRONTEND=noninteractive apt-get install -y -qq \
-                curl wget git ca-certificates gnupg build-essential
-
-            echo "System dependencies installed"
-            """,
-            timeout=600,
-            check=False,
-        )
-
-        if result.returncode == 0:
-            break
-
-        last_error = result.stderr
-        if attempt < max_retries - 1:
-            print(f"apt-get attempt {attempt + 1} failed, retrying...")
-            time.sleep(10)  # Wait before retry
-
-    assert result.returncode == 0, (
-        f"Failed to install dependencies after {max_retries} attempts: {last_error}"
-    )
-
-    # Phase 2: Install Go
-    result = exec_in_container(
-        container_name,
-        """
-        set -e
-        GO_VERSION="1.21.13"
-        wget -q https://go.dev/dl/go${GO_VERSION}.linux-amd64.tar.gz
-        rm -rf /usr/local/go
-        tar -C /usr/local -xzf go${GO_VERSION}.linux-amd64.tar.gz
-        rm go${GO_VERSION}.linux-amd64.tar.gz
-        echo 'export PATH=$PATH:/usr/local/go/bin' >> /root/.bashrc
-        /usr/local/go/bin/go version
-        """,
-        timeout=300,
-    )
-    assert result.returncode == 0, f"Failed to install Go: {result.stderr}"
+    # Phase 1: Verify the provisioned toolchain (installed by meta_base_image)
+    result = meta_shell.run("/usr/local/go/bin/go version", timeout=30)
     assert "go version" in result.stdout, "Go installation verification failed"
 
-    # Phase 3: Clone repository and build coi
+    # Phase 2: Clone repository and build coi
     # In CI (pull requests), use the PR branch and repository (handles forks correctly)
     github_branch = os.environ.get("GITHUB_HEAD_REF", "")
     github_repo_url = os.environ.get(
@@ -169,8 +50,7 @@ def test_full_installation_process(meta_container, coi_binary):
     else:
         clone_cmd = f"git clone {github_repo_url}"
 
-    result = exec_in_container(
-        container_name,
+    result = meta_shell.run(
         f"""
         set -e
         cd /root
@@ -181,27 +61,25 @@ def test_full_installation_process(meta_container, coi_binary):
         """,
         timeout=300,
     )
-    assert result.returncode == 0, f"Failed to build coi: {result.stderr}"
+    assert result.returncode == 0, f"Failed to build coi: {result.stdout}"
     assert "code-on-incus (coi) v" in result.stdout, "coi version check failed"
 
-    # Phase 4: Test coi --help
-    result = exec_in_container(
-        container_name,
+    # Phase 3: Test coi --help
+    result = meta_shell.run(
         """
         cd /root/code-on-incus
         ./coi --help
         """,
         timeout=30,
     )
-    assert result.returncode == 0, f"coi --help failed: {result.stderr}"
+    assert result.returncode == 0, f"coi --help failed: {result.stdout}"
     assert "code-on-incus (coi) is a CLI tool" in result.stdout, (
         "coi help output missing expected text"
     )
     assert "Available Commands:" in result.stdout, "coi help missing commands section"
 
-    # Phase 5: Test coi basic commands
-    result = exec_in_container(
-        container_name,
+    # Phase 4: Test coi basic commands
+    result = meta_shell.run(
         """
         cd /root/code-on-incus
         ./coi images --help
@@ -211,10 +89,10 @@ def test_full_installation_process(meta_container, coi_binary):
         """,
         timeout=30,
     )
-    assert result.returncode == 0, f"Basic coi commands failed: {result.stderr}"
+    assert result.returncode == 0, f"Basic coi commands failed: {result.stdout}"
 
 
-def test_installation_with_prebuilt_binary(meta_container, coi_binary):
+def test_installation_with_prebuilt_binary(meta_container, meta_shell, coi_binary):
     """
     Test installation using pre-built binary (simpler workflow).
 
@@ -239,8 +117,7 @@ def test_installation_with_prebuilt_binary(meta_container, coi_binary):
     assert result.returncode == 0, f"Failed to push binary: {result.stderr}"
 
     # Make executable and test
-    result = exec_in_container(
-        container_name,
+    result = meta_shell.run(
         """
         chmod +x /usr/local/bin/coi
         coi --help
@@ -248,5 +125,5 @@ def test_installation_with_prebuilt_binary(meta_container, coi_binary):
         """,
         timeout=30,
     )
-    assert result.returncode == 0, f"Pre-built binary test failed: {result.stderr}"
+    assert result.returncode == 0, f"Pre-built binary test failed: {result.stdout}"
     assert "code-on-incus (coi)" in result.stdout, "coi binary not working correctly"
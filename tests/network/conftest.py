@@ -0,0 +1,262 @@
+"""
+Pytest fixtures for network tests.
+"""
+
+import concurrent.futures
+import os
+import socket
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from support.helpers import (
+    ContainerShell,
+    calculate_container_name,
+    scaled_timeout,
+    wait_container_ready,
+    wait_for_container_dns,
+)
+
+# Per-test cap (pytest-timeout) for network tests: one container start plus
+# a handful of short probes. Bounds a hang at roughly one shell start rather
+# than the sum of every subprocess timeout in the test.
+NETWORK_TEST_TIMEOUT = 120
+
+
+def pytest_collection_modifyitems(config, items):
+    """Apply NETWORK_TEST_TIMEOUT to network tests that don't set their own."""
+    network_dir = Path(__file__).parent
+    timeout = pytest.mark.timeout(scaled_timeout(NETWORK_TEST_TIMEOUT))
+    for item in items:
+        if network_dir in item.path.parents and item.get_closest_marker("timeout") is None:
+            item.add_marker(timeout)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def network_preflight(coi_binary):
+    """Skip the network tests up front when coi or Incus can't run.
+
+    Every network test starts a container with a 60-90s timeout, so on a
+    host without a working coi binary or Incus daemon each one would sit
+    out that timeout before failing. The checks run once per session and
+    pytest caches the skip for every test that follows.
+    """
+    try:
+        result = subprocess.run([coi_binary, "--version"], capture_output=True, timeout=3)
+    except (OSError, subprocess.TimeoutExpired):
+        result = None
+    if result is None or result.returncode != 0:
+        pytest.skip("coi binary is not functional")
+
+    try:
+        result = subprocess.run(["incus", "version"], capture_output=True, timeout=3)
+    except (OSError, subprocess.TimeoutExpired):
+        result = None
+    # `incus version` still exits 0 when only the client works, reporting
+    # the server version as "unreachable"
+    if result is None or result.returncode != 0 or b"unreachable" in result.stdout:
+        pytest.skip("incus is not available")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def restricted_container_boot(request, coi_binary, network_preflight, tmp_path_factory):
+    """Boot the shared restricted-mode container in the background.
+
+    Autouse, so the boot begins with the first network test of the session
+    and overlaps with whatever runs before the restricted tests (usually
+    an allowlist test waiting on its own container); restricted_container
+    then only waits for whatever is left of it. Nothing is started when no
+    collected test uses restricted_container. Under pytest-xdist every
+    worker that runs network tests warms its own container. The container
+    is deleted at the end of the session.
+
+    Yields:
+        Future resolving to the `coi shell` CompletedProcess, or None
+    """
+    if not any("restricted_container" in item.fixturenames for item in request.session.items):
+        yield None
+        return
+
+    workspace = tmp_path_factory.mktemp("restricted") / "workspace"
+    workspace.mkdir()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        boot = executor.submit(
+            subprocess.run,
+            [
+                coi_binary,
+                "shell",
+                "--workspace",
+                str(workspace),
+                "--background",
+                "--print-name",
+                "--network=restricted",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=scaled_timeout(60),
+        )
+        yield boot
+
+    subprocess.run(
+        [coi_binary, "container", "delete", calculate_container_name(str(workspace), 1), "--force"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
+    )
+
+
+@pytest.fixture(scope="session")
+def restricted_container(coi_binary, restricted_container_boot):
+    """Return the shared restricted-mode container once it is ready.
+
+    The internet, gateway and blocked-destination tests only run read-only
+    probes from inside the container, so they reuse one `coi shell
+    --background` start (and its ACL setup) instead of paying for one each.
+    See restricted_container_boot for how it is started and cleaned up.
+
+    Returns:
+        Name of the running container
+    """
+    result = restricted_container_boot.result()
+
+    assert result.returncode == 0, f"Shell should start successfully. stderr: {result.stderr}"
+
+    # Should see "restricted" or "blocking" in the output (logged by the
+    # network manager whenever restricted mode is set up)
+    assert "restricted" in result.stderr.lower() or "blocking" in result.stderr.lower(), (
+        f"Should indicate restricted network mode. stderr: {result.stderr}"
+    )
+
+    # --print-name writes just the container name on stdout
+    container_name = result.stdout.strip()
+    assert container_name, f"Should print the container name. stderr: {result.stderr}"
+
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
+
+    return container_name
+
+
+ALLOWLIST_CONFIG = """
+[network]
+mode = "allowlist"
+allowed_domains = [
+    "8.8.8.8",                 # DNS server (required for resolution)
+    "1.1.1.1",                 # Cloudflare DNS
+    "registry.npmjs.org",      # Test domain
+{extra_entries}]
+refresh_interval_minutes = 30
+"""
+
+
+@pytest.fixture(scope="session")
+def npm_registry_ip():
+    """Resolve registry.npmjs.org once on the host.
+
+    The allowed-domain test pins curl to this address with --resolve, so
+    it checks the firewall rule without depending on DNS inside the
+    container.
+
+    Returns:
+        IPv4 address as a string, or None if the host can't resolve it
+    """
+    try:
+        return socket.getaddrinfo("registry.npmjs.org", 443, socket.AF_INET)[0][4][0]
+    except OSError:
+        return None
+
+
+@pytest.fixture(scope="session")
+def allowlist_config(tmp_path_factory, npm_registry_ip):
+    """Write the shared allowlist-mode config once and return its path.
+
+    The pre-resolved registry address is allowlisted explicitly, since
+    the registry sits behind a CDN and coi may resolve the domain to a
+    different address. Pass the path to `coi` through the COI_CONFIG
+    environment variable.
+    """
+    extra_entries = f'    "{npm_registry_ip}",\n' if npm_registry_ip else ""
+    config_file = tmp_path_factory.mktemp("coi") / "allowlist.toml"
+    config_file.write_text(ALLOWLIST_CONFIG.format(extra_entries=extra_entries))
+    return str(config_file)
+
+
+@pytest.fixture(scope="session")
+def allowlist_container(coi_binary, allowlist_config, tmp_path_factory):
+    """Start one allowlist-mode container shared by the allowlist probe tests.
+
+    Every allowlist assertion test only curls from inside the container
+    against the same allowlist (DNS servers plus registry.npmjs.org), so
+    they share a single `coi shell --background` start instead of each
+    booting their own. The container is deleted at the end of the session.
+
+    Yields:
+        Name of the running container
+    """
+    workspace = tmp_path_factory.mktemp("allowlist") / "workspace"
+    workspace.mkdir()
+
+    env = os.environ.copy()
+    env["COI_CONFIG"] = allowlist_config
+
+    result = subprocess.run(
+        [
+            coi_binary,
+            "shell",
+            "--workspace",
+            str(workspace),
+            "--background",
+            "--print-name",
+            "--network=allowlist",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=scaled_timeout(90),
+        env=env,
+    )
+
+    assert result.returncode == 0, f"Failed to start container: {result.stderr}"
+
+    # --print-name writes just the container name on stdout
+    container_name = result.stdout.strip()
+    assert container_name, f"Could not find container name in output: {result.stderr}"
+
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
+
+    # DNS goes through the bridge's dnsmasq on the gateway, which allowlist
+    # mode always permits; just wait for the resolver to come up
+    assert wait_for_container_dns(coi_binary, container_name), "DNS should work in container"
+
+    yield container_name
+
+    subprocess.run(
+        [coi_binary, "container", "delete", container_name, "--force"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
+    )
+
+
+@pytest.fixture(scope="session")
+def restricted_shell(restricted_container):
+    """One bash session inside the shared restricted-mode container.
+
+    Probe tests send their commands through it rather than paying for a
+    new `coi container exec` each. stderr is merged into stdout.
+    """
+    shell = ContainerShell(restricted_container)
+    yield shell
+    shell.close()
+
+
+@pytest.fixture(scope="session")
+def allowlist_shell(allowlist_container):
+    """One bash session inside the shared allowlist-mode container.
+
+    Probe tests send their commands through it rather than paying for a
+    new `coi container exec` each. stderr is merged into stdout.
+    """
+    shell = ContainerShell(allowlist_container)
+    yield shell
+    shell.close()
@@ -8,7 +8,8 @@ Tests that:
 """
 
 import subprocess
-import time
+
+from support.helpers import scaled_timeout, wait_container_ready
 
 
 def test_open_mode_allows_all(coi_binary, workspace_dir, cleanup_containers):
@@ -31,11 +32,12 @@ def test_open_mode_allows_all(coi_binary, workspace_dir, cleanup_containers):
             "--network",
             "open",
             "--background",
+            "--print-name",
             "--debug",
         ],
         capture_output=True,
         text=True,
-        timeout=60,
+        timeout=scaled_timeout(60),
     )
 
     assert result.returncode == 0, f"Shell should start successfully. stderr: {result.stderr}"
@@ -45,19 +47,13 @@ def test_open_mode_allows_all(coi_binary, workspace_dir, cleanup_containers):
         f"Should indicate open network mode. stderr: {result.stderr}"
     )
 
-    # Extract container name from output
-    container_name = None
-    for line in result.stderr.split("\n"):
-        if "Container name:" in line:
-            container_name = line.split("Container name:")[-1].strip()
-            break
+    # --print-name writes just the container name on stdout
+    container_name = result.stdout.strip()
 
-    assert container_name is not None, (
-        f"Should find container name in output. stderr: {result.stderr}"
-    )
+    assert container_name, f"Should print the container name. stderr: {result.stderr}"
 
-    # Give container time to fully start
-    time.sleep(5)
+    # Wait for the container to fully start
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
 
     # Test 1: Public internet should work
     result = subprocess.run(
@@ -7,8 +7,10 @@ Tests that:
 3. Works regardless of what private network range the host uses
 """
 
+import ipaddress
 import subprocess
-import time
+
+from support.helpers import scaled_timeout, wait_container_ready
 
 
 def test_open_allows_local_gateway(coi_binary, workspace_dir, cleanup_containers):
@@ -38,11 +40,12 @@ def test_open_allows_local_gateway(coi_binary, workspace_dir, cleanup_containers
             "--network",
             "open",
             "--background",
+            "--print-name",
             "--debug",
         ],
         capture_output=True,
         text=True,
-        timeout=60,
+        timeout=scaled_timeout(60),
     )
 
     assert result.returncode == 0, f"Shell should start successfully. stderr: {result.stderr}"
@@ -52,19 +55,13 @@ def test_open_allows_local_gateway(coi_binary, workspace_dir, cleanup_containers
         f"Should indicate open network mode. stderr: {result.stderr}"
     )
 
-    # Extract container name from output
-    container_name = None
-    for line in result.stderr.split("\n"):
-        if "Container name:" in line:
-            container_name = line.split("Container name:")[-1].strip()
-            break
+    # --print-name writes just the container name on stdout
+    container_name = result.stdout.strip()
 
-    assert container_name is not None, (
-        f"Should find container name in output. stderr: {result.stderr}"
-    )
+    assert container_name, f"Should print the container name. stderr: {result.stderr}"
 
-    # Give container time to fully start
-    time.sleep(5)
+    # Wait for the container to fully start
+    assert wait_container_ready(coi_binary, container_name), "Container should become ready"
 
     # First, verify internet access works (sanity check)
     result = subprocess.run(
@@ -116,12 +113,9 @@ def test_open_allows_local_gateway(coi_binary, workspace_dir, cleanup_containers
     assert gateway_ip is not None, f"Should be able to discover gateway IP. Got: {output}"
 
     # Verify gateway is in RFC1918 range
-    is_private = (
-        gateway_ip.startswith("10.")
-        or gateway_ip.startswith("192.168.")
-        or any(gateway_ip.startswith(f"172.{i}.") for i in range(16, 32))
+    assert ipaddress.ip_address(gateway_ip).is_private, (
+        f"Gateway {gateway_ip} should be in RFC1918 private range"
     )
-    assert is_private, f"Gateway {gateway_ip} should be in RFC1918 private range"
 
     # Try to connect to the gateway
     # In open mode, this should NOT be blocked by ACL
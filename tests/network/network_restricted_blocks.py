@@ -0,0 +1,50 @@
+"""
+Test for network isolation - restricted mode blocks internal destinations.
+
+Tests that:
+1. Container cannot reach cloud metadata service at 169.254.169.254
+2. Blocks 10.0.0.0/8
+3. Blocks 172.16.0.0/12
+4. Blocks 192.168.0.0/16
+
+Network isolation is implemented using firewalld direct rules.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        "169.254.169.254/latest/meta-data/",  # AWS/GCP/Azure metadata endpoint
+        "10.0.0.1",
+        "172.16.0.1",
+        "192.168.1.1",
+    ],
+)
+def test_restricted_blocks(restricted_shell, target):
+    """
+    Test that restricted mode blocks access to metadata and private networks.
+
+    Flow:
+    1. Take the shared restricted-mode container
+    2. Try to curl the blocked target
+    3. Verify connection is blocked/rejected
+    """
+    result = restricted_shell.run_args(
+        [
+            "curl",
+            "-s",
+            "--connect-timeout",
+            "0.5",
+            "--max-time",
+            "1",
+            "-o",
+            "/dev/null",
+            f"http://{target}",
+        ],
+        timeout=10,
+    )
+
+    # Should fail (non-zero exit code) or timeout
+    assert result.returncode != 0, f"Should not be able to reach {target}: {result.stdout}"
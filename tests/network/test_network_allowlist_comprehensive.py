@@ -12,6 +12,8 @@ import subprocess
 import tempfile
 import time
 
+from support.helpers import get_container_name_from_output, scaled_timeout, wait_for_container_dns
+
 
 def test_allowlist_allows_specified_domains(coi_binary, workspace_dir, cleanup_containers):
     """
@@ -49,37 +51,21 @@ refresh_interval_minutes = 30
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
-        # Fix DNS in container (required for resolution)
-        subprocess.run(
-            [
-                coi_binary,
-                "container",
-                "exec",
-                container_name,
-                "--",
-                "bash",
-                "-c",
-                "echo 'nameserver 8.8.8.8' > /etc/resolv.conf",
-            ],
-            capture_output=True,
-            timeout=10,
-        )
+        # DNS goes through the bridge's dnsmasq on the gateway, which allowlist
+        # mode always permits; just wait for the resolver to come up
+        assert wait_for_container_dns(coi_binary, container_name), "DNS should work in container"
 
         # Test: curl allowed domain (should work)
         result = subprocess.run(
@@ -142,37 +128,21 @@ refresh_interval_minutes = 30
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
-        # Fix DNS in container
-        subprocess.run(
-            [
-                coi_binary,
-                "container",
-                "exec",
-                container_name,
-                "--",
-                "bash",
-                "-c",
-                "echo 'nameserver 8.8.8.8' > /etc/resolv.conf",
-            ],
-            capture_output=True,
-            timeout=10,
-        )
+        # DNS goes through the bridge's dnsmasq on the gateway, which allowlist
+        # mode always permits; just wait for the resolver to come up
+        assert wait_for_container_dns(coi_binary, container_name), "DNS should work in container"
 
         # Wait for firewall rules to be fully applied (CI timing issue)
         time.sleep(2)
@@ -191,13 +161,15 @@ refresh_interval_minutes = 30
                 "5",
                 "http://example.com",
             ],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
         )
 
         # Connection should fail (blocked)
-        assert result.returncode != 0, f"Non-allowed domain should be blocked: {result.stderr}"
+        assert result.returncode != 0, (
+            f"Non-allowed domain should be blocked: {result.stderr.decode(errors='replace')}"
+        )
 
         # Test: curl github.com (NOT in allowlist, should fail)
         result = subprocess.run(
@@ -213,13 +185,15 @@ refresh_interval_minutes = 30
                 "5",
                 "https://github.com",
             ],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
         )
 
         # Connection should fail (blocked)
-        assert result.returncode != 0, f"Non-allowed domain should be blocked: {result.stderr}"
+        assert result.returncode != 0, (
+            f"Non-allowed domain should be blocked: {result.stderr.decode(errors='replace')}"
+        )
 
     finally:
         os.unlink(config_file)
@@ -261,19 +235,15 @@ refresh_interval_minutes = 30
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -291,14 +261,14 @@ refresh_interval_minutes = 30
                 "5",
                 "http://10.0.0.1",
             ],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
         )
 
         # Connection should fail (RFC1918 blocking takes precedence)
         assert result.returncode != 0, (
-            f"RFC1918 should be blocked even in allowlist: {result.stderr}"
+            f"RFC1918 should be blocked even in allowlist: {result.stderr.decode(errors='replace')}"
         )
 
         # Test: attempt connection to 192.168.1.1 (even though in allowlist)
@@ -315,14 +285,14 @@ refresh_interval_minutes = 30
                 "5",
                 "http://192.168.1.1",
             ],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=10,
         )
 
         # Connection should fail (RFC1918 blocking takes precedence)
         assert result.returncode != 0, (
-            f"RFC1918 should be blocked even in allowlist: {result.stderr}"
+            f"RFC1918 should be blocked even in allowlist: {result.stderr.decode(errors='replace')}"
         )
 
     finally:
@@ -364,19 +334,15 @@ refresh_interval_minutes = 30
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -442,19 +408,15 @@ refresh_interval_minutes = 30
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -472,13 +434,15 @@ refresh_interval_minutes = 30
                 "example.com",
                 "9.9.9.9",
             ],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             timeout=15,
         )
 
         # DNS query should fail (blocked)
-        assert result.returncode != 0, f"Non-allowed DNS server should be blocked: {result.stderr}"
+        assert result.returncode != 0, (
+            f"Non-allowed DNS server should be blocked: {result.stderr.decode(errors='replace')}"
+        )
 
     finally:
         os.unlink(config_file)
@@ -7,11 +7,18 @@ but that host can access container services (response traffic allowed).
 Network isolation is implemented using firewalld direct rules.
 """
 
-import json
 import os
 import subprocess
 import tempfile
-import time
+
+from support.helpers import (
+    get_container_ipv4,
+    get_container_name_from_output,
+    poll_until,
+    scaled_timeout,
+    wait_container_ready,
+    wait_port_open,
+)
 
 
 def test_restricted_blocks_rfc1918_addresses(coi_binary, workspace_dir, cleanup_containers):
@@ -45,19 +52,15 @@ mode = "restricted"
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -135,19 +138,15 @@ refresh_interval_minutes = 30
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -221,41 +220,26 @@ mode = "restricted"
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
-        # Wait for container to be fully ready
-        time.sleep(2)
+        assert wait_container_ready(coi_binary, container_name), "Container should become ready"
 
         # Get container's IP address using incus list (more reliable than hostname -I)
-        result = subprocess.run(
-            ["incus", "list", container_name, "--format=json"],
-            capture_output=True,
-            text=True,
-            timeout=10,
+        # The container can run commands before DHCP has given it an address
+        assert poll_until(lambda: get_container_ipv4(container_name), timeout=scaled_timeout(30)), (
+            f"No IPv4 address found for container {container_name}"
         )
-
-        assert result.returncode == 0, f"Failed to get container info: {result.stderr}"
-
-        container_info = json.loads(result.stdout)[0]
-        # Get eth0 IP address (container network IP, not Docker bridge IP)
-        eth0_addresses = container_info["state"]["network"]["eth0"]["addresses"]
-        ipv4_addresses = [addr["address"] for addr in eth0_addresses if addr["family"] == "inet"]
-        assert ipv4_addresses, f"No IPv4 address found for container {container_name}"
-        container_ip = ipv4_addresses[0]
+        container_ip = get_container_ipv4(container_name)
 
         # Start HTTP server in container
         server_proc = subprocess.Popen(
@@ -274,8 +258,8 @@ mode = "restricted"
             stderr=subprocess.PIPE,
         )
 
-        # Give server time to start
-        time.sleep(3)
+        # Wait for the server to start listening
+        assert wait_port_open(container_ip, 8080), "HTTP server should start in container"
 
         try:
             # Test: host curls container service (should work - response traffic allowed)
@@ -12,6 +12,8 @@ import os
 import subprocess
 import tempfile
 
+from support.helpers import get_container_name_from_output, scaled_timeout
+
 
 def test_open_allows_public_internet(coi_binary, workspace_dir, cleanup_containers):
     """
@@ -43,19 +45,15 @@ mode = "open"
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -141,19 +139,15 @@ mode = "open"
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -223,19 +217,15 @@ mode = "open"
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
@@ -307,19 +297,15 @@ mode = "open"
             ],
             capture_output=True,
             text=True,
-            timeout=90,
+            timeout=scaled_timeout(60),
             env=env,
         )
 
         assert result.returncode == 0, f"Failed to start container: {result.stderr}"
 
         # Extract container name from output
-        container_name = None
         output = result.stdout + result.stderr
-        for line in output.split("\n"):
-            if "Container: " in line:
-                container_name = line.split("Container: ")[1].strip()
-                break
+        container_name = get_container_name_from_output(output)
 
         assert container_name, f"Could not find container name in output: {output}"
 
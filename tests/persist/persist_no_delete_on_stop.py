@@ -16,7 +16,7 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_stopped
 
 
 def create_session_metadata(container_name, workspace_dir, persistent=False):
@@ -101,7 +101,7 @@ def test_persist_no_delete_on_stop(coi_binary, cleanup_containers, workspace_dir
     )
     assert result.returncode == 0, f"Container stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(5)  # Wait for stop to complete
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # === Phase 4: Verify container still exists ===
 
@@ -0,0 +1,149 @@
+"""
+Pytest fixtures for run tests.
+"""
+
+import os
+import re
+import subprocess
+
+import pytest
+
+from support.helpers import calculate_container_name, scaled_timeout
+
+# Slot of the persistent container shared by the run tests; it lives in its
+# own workspace, so it never clashes with a test's cleanup_containers slots
+PERSISTENT_RUN_SLOT = 99
+
+# Commands run together by the run_sections fixture, keyed by section name.
+# Each one only inspects what a command sees inside the container, so they
+# can share a single `coi run` instead of paying for one each.
+RUN_SECTIONS = {
+    "whoami": "whoami",
+    "uid": "id -u",
+    "cwd": "pwd",
+    "mount": "cat /workspace/mount-test.txt",
+    "env": "echo $MY_TEST_VAR",
+    "multiple_env": "echo $VAR1 $VAR2",
+    "multiline": "echo first; echo second; echo third",
+    "pipe": "echo 'hello world' | grep hello",
+}
+RUN_SECTIONS_ENV = ["MY_TEST_VAR=test-value-xyz", "VAR1=value1", "VAR2=value2"]
+MOUNT_TEST_CONTENT = "workspace-mount-test-content-abc123"
+
+_SECTION_RE = re.compile(r"^---BEGIN:(\w+)---\n(.*?)^---END:\1:(\d+)---$", re.MULTILINE | re.DOTALL)
+
+
+@pytest.fixture(scope="package")
+def persistent_run_workspace(coi_binary, tmp_path_factory):
+    """Create the persistent container the run tests share and return its workspace.
+
+    Most run tests only check what a command sees inside the container
+    (user, cwd, env, output). Launching a fresh container from the image
+    for each of them dominates their runtime, so they run against one
+    `--persistent` container instead: it is launched and has the workspace
+    mounted once, and every later `coi run` just restarts it. The
+    container is deleted when the run tests are done.
+
+    Yields:
+        Path of the workspace mounted in the shared container
+    """
+    workspace = tmp_path_factory.mktemp("run") / "workspace"
+    workspace.mkdir()
+    workspace_dir = str(workspace)
+
+    result = subprocess.run(
+        [
+            coi_binary,
+            "run",
+            "--workspace",
+            workspace_dir,
+            "--persistent",
+            "--slot",
+            str(PERSISTENT_RUN_SLOT),
+            "true",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=scaled_timeout(180),
+    )
+    assert result.returncode == 0, f"Priming run should succeed. stderr: {result.stderr}"
+
+    yield workspace_dir
+
+    subprocess.run(
+        [
+            coi_binary,
+            "container",
+            "delete",
+            calculate_container_name(workspace_dir, PERSISTENT_RUN_SLOT),
+            "--force",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=scaled_timeout(30),
+    )
+
+
+@pytest.fixture(scope="package")
+def persistent_run(coi_binary, persistent_run_workspace):
+    """Return the `coi run` argv prefix that targets the shared persistent container.
+
+    Append the command to run, e.g. `persistent_run + ["whoami"]`.
+
+    Note: only use it for commands that exit 0. On a non-zero exit `coi run`
+    exits without stopping the container, and the next run would then fail
+    to start it.
+    """
+    return [
+        coi_binary,
+        "run",
+        "--workspace",
+        persistent_run_workspace,
+        "--persistent",
+        "--slot",
+        str(PERSISTENT_RUN_SLOT),
+    ]
+
+
+def _sections_script(sections):
+    """Build one sh script running each section in a subshell between markers."""
+    return "\n".join(
+        f"echo '---BEGIN:{name}---'\n( {command}\n) 2>&1\necho \"---END:{name}:$?---\""
+        for name, command in sections.items()
+    )
+
+
+@pytest.fixture(scope="package")
+def run_sections(persistent_run, persistent_run_workspace):
+    """Run every RUN_SECTIONS command through one `coi run` and split the output.
+
+    The script always ends with an echo, so the run exits 0 and the shared
+    persistent container is stopped normally whatever a section returns.
+    Each section's exit status is reported through its end marker.
+
+    Returns:
+        Dict of section name -> CompletedProcess (stdout has the section's
+        merged output; stderr is coi's own stderr for the whole run)
+    """
+    with open(os.path.join(persistent_run_workspace, "mount-test.txt"), "w") as f:
+        f.write(MOUNT_TEST_CONTENT)
+
+    env_args = [arg for var in RUN_SECTIONS_ENV for arg in ("-e", var)]
+    result = subprocess.run(
+        [*persistent_run, *env_args, "--", "sh", "-c", _sections_script(RUN_SECTIONS)],
+        capture_output=True,
+        text=True,
+        timeout=scaled_timeout(180),
+    )
+    assert result.returncode == 0, f"Batched run should succeed. stderr: {result.stderr}"
+
+    sections = {
+        name: subprocess.CompletedProcess(
+            RUN_SECTIONS[name], int(status), stdout=output, stderr=result.stderr
+        )
+        for name, output, status in _SECTION_RE.findall(result.stdout)
+    }
+    assert set(sections) == set(RUN_SECTIONS), (
+        f"Every section should report back. stdout:\n{result.stdout}"
+    )
+    return sections
@@ -6,25 +6,17 @@ Tests that:
 2. Verify it runs as 'code' user
 """
 
-import subprocess
 
-
-def test_run_as_code_user(coi_binary, cleanup_containers, workspace_dir):
+def test_run_as_code_user(run_sections):
     """
     Test that commands run as the code user.
 
     Flow:
-    1. Run coi run whoami
+    1. Take the whoami section of the batched coi run
     2. Verify output is 'code'
     """
-    result = subprocess.run(
-        [coi_binary, "run", "--workspace", workspace_dir, "whoami"],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["whoami"]
 
-    assert result.returncode == 0, f"Run should succeed. stderr: {result.stderr}"
+    assert result.returncode == 0, f"whoami should succeed. Output:\n{result.stdout}"
 
-    combined_output = result.stdout + result.stderr
-    assert "code" in combined_output, f"Should run as 'code' user. Got:\n{combined_output}"
+    assert "code" in result.stdout, f"Should run as 'code' user. Got:\n{result.stdout}"
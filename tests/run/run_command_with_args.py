@@ -9,7 +9,7 @@ Tests that:
 import subprocess
 
 
-def test_run_command_with_args(coi_binary, cleanup_containers, workspace_dir):
+def test_run_command_with_args(persistent_run):
     """
     Test running a command with multiple arguments.
 
@@ -18,7 +18,7 @@ def test_run_command_with_args(coi_binary, cleanup_containers, workspace_dir):
     2. Verify output shows all args were received
     """
     result = subprocess.run(
-        [coi_binary, "run", "--workspace", workspace_dir, "echo", "arg1", "arg2", "arg3"],
+        [*persistent_run, "echo", "arg1", "arg2", "arg3"],
         capture_output=True,
         text=True,
         timeout=180,
@@ -6,25 +6,17 @@ Tests that:
 2. Verify CWD is /workspace
 """
 
-import subprocess
 
-
-def test_run_cwd_is_workspace(coi_binary, cleanup_containers, workspace_dir):
+def test_run_cwd_is_workspace(run_sections):
     """
     Test that current working directory is /workspace.
 
     Flow:
-    1. Run coi run pwd
+    1. Take the pwd section of the batched coi run
     2. Verify output shows /workspace
     """
-    result = subprocess.run(
-        [coi_binary, "run", "--workspace", workspace_dir, "pwd"],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["cwd"]
 
-    assert result.returncode == 0, f"Run should succeed. stderr: {result.stderr}"
+    assert result.returncode == 0, f"pwd should succeed. Output:\n{result.stdout}"
 
-    combined_output = result.stdout + result.stderr
-    assert "/workspace" in combined_output, f"CWD should be /workspace. Got:\n{combined_output}"
+    assert "/workspace" in result.stdout, f"CWD should be /workspace. Got:\n{result.stdout}"
@@ -9,7 +9,7 @@ Tests that:
 import subprocess
 
 
-def test_run_exit_code_success(coi_binary, cleanup_containers, workspace_dir):
+def test_run_exit_code_success(persistent_run):
     """
     Test that successful command returns exit code 0.
 
@@ -18,7 +18,7 @@ def test_run_exit_code_success(coi_binary, cleanup_containers, workspace_dir):
     2. Verify exit code is 0
     """
     result = subprocess.run(
-        [coi_binary, "run", "--workspace", workspace_dir, "true"],
+        [*persistent_run, "true"],
         capture_output=True,
         text=True,
         timeout=180,
@@ -6,38 +6,21 @@ Tests that:
 2. Verify all statements execute
 """
 
-import subprocess
 
-
-def test_run_multiline_command(coi_binary, cleanup_containers, workspace_dir):
+def test_run_multiline_command(run_sections):
     """
     Test running multi-statement command.
 
     Flow:
-    1. Run coi run with multiple statements
+    1. Take the multi-statement section of the batched coi run
     2. Verify all statements execute
     """
-    result = subprocess.run(
-        [
-            coi_binary,
-            "run",
-            "--workspace",
-            workspace_dir,
-            "--",
-            "sh",
-            "-c",
-            "echo first; echo second; echo third",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["multiline"]
 
     assert result.returncode == 0, (
-        f"Multi-statement command should succeed. stderr: {result.stderr}"
+        f"Multi-statement command should succeed. Output:\n{result.stdout}"
     )
 
-    combined_output = result.stdout + result.stderr
-    assert "first" in combined_output, f"Output should contain 'first'. Got:\n{combined_output}"
-    assert "second" in combined_output, f"Output should contain 'second'. Got:\n{combined_output}"
-    assert "third" in combined_output, f"Output should contain 'third'. Got:\n{combined_output}"
+    assert "first" in result.stdout, f"Output should contain 'first'. Got:\n{result.stdout}"
+    assert "second" in result.stdout, f"Output should contain 'second'. Got:\n{result.stdout}"
+    assert "third" in result.stdout, f"Output should contain 'third'. Got:\n{result.stdout}"
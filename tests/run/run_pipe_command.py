@@ -6,34 +6,17 @@ Tests that:
 2. Verify output is correct
 """
 
-import subprocess
 
-
-def test_run_pipe_command(coi_binary, cleanup_containers, workspace_dir):
+def test_run_pipe_command(run_sections):
     """
     Test running command with pipes.
 
     Flow:
-    1. Run coi run with a pipe command
+    1. Take the pipe section of the batched coi run
     2. Verify output is correct
     """
-    result = subprocess.run(
-        [
-            coi_binary,
-            "run",
-            "--workspace",
-            workspace_dir,
-            "--",
-            "sh",
-            "-c",
-            "echo 'hello world' | grep hello",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["pipe"]
 
-    assert result.returncode == 0, f"Pipe command should succeed. stderr: {result.stderr}"
+    assert result.returncode == 0, f"Pipe command should succeed. Output:\n{result.stdout}"
 
-    combined_output = result.stdout + result.stderr
-    assert "hello" in combined_output, f"Output should contain 'hello'. Got:\n{combined_output}"
+    assert "hello" in result.stdout, f"Output should contain 'hello'. Got:\n{result.stdout}"
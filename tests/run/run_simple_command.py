@@ -10,7 +10,7 @@ Tests that:
 import subprocess
 
 
-def test_run_simple_command(coi_binary, cleanup_containers, workspace_dir):
+def test_run_simple_command(persistent_run):
     """
     Test running a simple echo command.
 
@@ -20,7 +20,7 @@ def test_run_simple_command(coi_binary, cleanup_containers, workspace_dir):
     3. Verify success exit code
     """
     result = subprocess.run(
-        [coi_binary, "run", "--workspace", workspace_dir, "echo", "hello-test-xyz-123"],
+        [*persistent_run, "echo", "hello-test-xyz-123"],
         capture_output=True,
         text=True,
         timeout=180,
@@ -6,25 +6,17 @@ Tests that:
 2. Verify UID is 1000
 """
 
-import subprocess
 
-
-def test_run_uid_1000(coi_binary, cleanup_containers, workspace_dir):
+def test_run_uid_1000(run_sections):
     """
     Test that commands run with UID 1000.
 
     Flow:
-    1. Run coi run id
+    1. Take the `id -u` section of the batched coi run
     2. Verify UID is 1000
     """
-    result = subprocess.run(
-        [coi_binary, "run", "--workspace", workspace_dir, "--", "id", "-u"],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["uid"]
 
-    assert result.returncode == 0, f"Run should succeed. stderr: {result.stderr}"
+    assert result.returncode == 0, f"id should succeed. Output:\n{result.stdout}"
 
-    combined_output = result.stdout + result.stderr
-    assert "1000" in combined_output, f"Should run with UID 1000. Got:\n{combined_output}"
+    assert "1000" in result.stdout, f"Should run with UID 1000. Got:\n{result.stdout}"
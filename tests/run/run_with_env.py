@@ -6,38 +6,19 @@ Tests that:
 2. Verify env var is available in container
 """
 
-import subprocess
 
-
-def test_run_with_env(coi_binary, cleanup_containers, workspace_dir):
+def test_run_with_env(run_sections):
     """
     Test running command with environment variables.
 
     Flow:
-    1. Run coi run -e MY_VAR=test123 env
-    2. Verify MY_VAR appears in output
+    1. Take the section echoing $MY_TEST_VAR (set with -e on the batched coi run)
+    2. Verify the value appears in output
     """
-    result = subprocess.run(
-        [
-            coi_binary,
-            "run",
-            "--workspace",
-            workspace_dir,
-            "-e",
-            "MY_TEST_VAR=test-value-xyz",
-            "--",
-            "sh",
-            "-c",
-            "echo $MY_TEST_VAR",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["env"]
 
-    assert result.returncode == 0, f"Run should succeed. stderr: {result.stderr}"
+    assert result.returncode == 0, f"Echo should succeed. Output:\n{result.stdout}"
 
-    combined_output = result.stdout + result.stderr
-    assert "test-value-xyz" in combined_output, (
-        f"Output should contain env var value. Got:\n{combined_output}"
+    assert "test-value-xyz" in result.stdout, (
+        f"Output should contain env var value. Got:\n{result.stdout}"
     )
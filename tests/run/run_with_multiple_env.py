@@ -6,39 +6,18 @@ Tests that:
 2. Verify all env vars are set
 """
 
-import subprocess
 
-
-def test_run_with_multiple_env(coi_binary, cleanup_containers, workspace_dir):
+def test_run_with_multiple_env(run_sections):
     """
     Test running command with multiple environment variables.
 
     Flow:
-    1. Run coi run with multiple -e flags
+    1. Take the section echoing $VAR1 $VAR2 (each set with -e on the batched coi run)
     2. Verify all env vars are set
     """
-    result = subprocess.run(
-        [
-            coi_binary,
-            "run",
-            "--workspace",
-            workspace_dir,
-            "-e",
-            "VAR1=value1",
-            "-e",
-            "VAR2=value2",
-            "--",
-            "sh",
-            "-c",
-            "echo $VAR1 $VAR2",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=180,
-    )
+    result = run_sections["multiple_env"]
 
-    assert result.returncode == 0, f"Run should succeed. stderr: {result.stderr}"
+    assert result.returncode == 0, f"Echo should succeed. Output:\n{result.stdout}"
 
-    combined_output = result.stdout + result.stderr
-    assert "value1" in combined_output, f"Output should contain VAR1 value. Got:\n{combined_output}"
-    assert "value2" in combined_output, f"Output should contain VAR2 value. Got:\n{combined_output}"
+    assert "value1" in result.stdout, f"Output should contain VAR1 value. Got:\n{result.stdout}"
+    assert "value2" in result.stdout, f"Output should contain VAR2 value. Got:\n{result.stdout}"
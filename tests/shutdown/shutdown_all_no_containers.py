@@ -9,7 +9,10 @@ Tests that:
 
 import subprocess
 
+import pytest
 
+
+@pytest.mark.serial
 def test_shutdown_all_no_containers(coi_binary, cleanup_containers):
     """
     Test shutdown --all when no containers exist.
@@ -15,7 +15,7 @@ force-kill attempt executes.
 import subprocess
 import time
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_stopped
 
 
 def test_shutdown_no_spurious_errors(coi_binary, cleanup_containers, workspace_dir):
@@ -53,7 +53,7 @@ def test_shutdown_no_spurious_errors(coi_binary, cleanup_containers, workspace_d
     )
     assert result.returncode == 0, f"Stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # Now shutdown the already-stopped container with a timeout
     # This simulates the race condition where graceful shutdown completes
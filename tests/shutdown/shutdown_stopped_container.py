@@ -10,7 +10,7 @@ Tests that:
 import subprocess
 import time
 
-from support.helpers import calculate_container_name
+from support.helpers import calculate_container_name, wait_container_stopped
 
 
 def test_shutdown_stopped_container(coi_binary, cleanup_containers, workspace_dir):
@@ -46,7 +46,7 @@ def test_shutdown_stopped_container(coi_binary, cleanup_containers, workspace_di
     )
     assert result.returncode == 0, f"Stop should succeed. stderr: {result.stderr}"
 
-    time.sleep(2)
+    assert wait_container_stopped(container_name), "Container should stop"
 
     # Verify container exists but is stopped
     result = subprocess.run(
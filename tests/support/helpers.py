@@ -2,17 +2,30 @@
 Helper utilities for pexpect-based CLI tests.
 """
 
+import asyncio
 import contextlib
+import fcntl
+import functools
+import hashlib
+import json
 import os
 import re
+import selectors
+import shlex
+import shutil
+import socket
 import subprocess
 import sys
+import tempfile
 import threading
 import time
+import uuid
 from pathlib import Path
 
 from pexpect import EOF, TIMEOUT, spawn
 
+from support.incus_client import IncusClientError, shared_client
+
 try:
     import pyte
 
@@ -20,6 +33,31 @@ try:
 except ImportError:
     HAS_PYTE = False
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def loads_json(data):
+    """
+    Parse JSON output from a command, using orjson when it is installed.
+
+    orjson is an optional speedup; without it the stdlib parser is used.
+    Both raise json.JSONDecodeError (orjson's error subclasses it).
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        The parsed object
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class TerminalEmulator:
     """
@@ -447,6 +485,263 @@ def exit_claude(child, timeout=60, use_ctrl_c=False):
         return False
 
 
+def wait_for_eof(child, timeout=30, poll_interval=0.05):
+    """
+    Wait for the child to reach EOF, draining output in small reads.
+
+    Each read_nonblocking() call blocks in select() for at most
+    poll_interval, so EOF (e.g. after a tmux detach) is noticed within
+    roughly that interval rather than at the pace of a pattern search.
+    Output read along the way still reaches child.logfile_read.
+
+    Args:
+        child: pexpect.spawn object
+        timeout: Maximum time to wait in seconds (default: 30)
+        poll_interval: Maximum time each read waits for data (default: 0.05)
+
+    Returns:
+        True if EOF was reached, False if timeout
+    """
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        try:
+            child.read_nonblocking(size=4096, timeout=poll_interval)
+        except EOF:
+            return True
+        except TIMEOUT:
+            continue
+
+    return False
+
+
+# Locks currently held by this process: name -> nesting depth
+_held_file_locks = {}
+
+
+@contextlib.contextmanager
+def file_lock(name):
+    """
+    Hold an exclusive lock shared by every test process on this host.
+
+    Used to serialize access to host-wide resources when tests run in
+    parallel under pytest-xdist, e.g. the fixed "coi-build" container that
+    every `coi build` uses, or the Incus network DNS config.
+
+    The lock is re-entrant within a process, so a fixture holding it can
+    depend on another fixture that takes it too.
+
+    Args:
+        name: Lock name (one lock file per name in the temp directory)
+
+    Example:
+        with file_lock("coi-build"):
+            subprocess.run([coi_binary, "build", ...])
+    """
+    if _held_file_locks.get(name):
+        _held_file_locks[name] += 1
+        try:
+            yield
+        finally:
+            _held_file_locks[name] -= 1
+        return
+
+    path = os.path.join(tempfile.gettempdir(), f"coi-test-{name}.lock")
+    with open(path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        _held_file_locks[name] = 1
+        try:
+            yield
+        finally:
+            _held_file_locks[name] = 0
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def poll_until(predicate, timeout=30, interval=0.05, max_interval=0.5):
+    """
+    Poll a predicate until it returns truthy or timeout occurs.
+
+    Starts with a short interval and backs off linearly up to max_interval,
+    so fast state transitions are observed quickly without busy-looping on
+    slow ones.
+
+    Args:
+        predicate: Zero-argument callable to evaluate
+        timeout: Maximum time to wait in seconds (default: 30)
+        interval: Initial delay between checks in seconds (default: 0.05)
+        max_interval: Upper bound for the delay between checks (default: 0.5)
+
+    Returns:
+        True if predicate became truthy, False if timeout
+
+    Example:
+        assert poll_until(lambda: name in get_container_list(), timeout=10)
+    """
+    deadline = time.time() + timeout
+    delay = interval
+
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay + interval, max_interval)
+
+
+def wait_container_ready(coi_binary, container_name, timeout=30):
+    """
+    Wait until a freshly launched container accepts exec commands.
+
+    Probes with `coi container exec <name> -- true`, backing off
+    exponentially from 0.1s up to 1s between attempts. Replaces a fixed
+    sleep after launch: warm hosts return almost immediately, slow hosts
+    get up to the full timeout.
+
+    Args:
+        coi_binary: Path to coi binary
+        container_name: Name of the container to probe
+        timeout: Maximum time to wait in seconds (default: 30)
+
+    Returns:
+        True if the container became ready, False if timeout
+
+    Example:
+        assert wait_container_ready(coi_binary, container_name)
+    """
+    deadline = time.time() + timeout
+    attempt = 0
+
+    while True:
+        try:
+            result = fast_run(
+                [coi_binary, "container", "exec", container_name, "--", "true"],
+                capture_output=True,
+                timeout=2,
+            )
+            if result.returncode == 0:
+                return True
+        except subprocess.TimeoutExpired:
+            pass
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        time.sleep(min(0.1 * 2**attempt, 1.0, remaining))
+        attempt += 1
+
+
+def wait_for_container_dns(coi_binary, container_name, hostname="example.com", timeout=30):
+    """
+    Wait until a container can resolve a public hostname.
+
+    Network tests that reach the internet need DNS working, not just a
+    running container, and right after startup the resolver may not be
+    up yet. Probes with `getent hosts <hostname>` inside the container.
+
+    Args:
+        coi_binary: Path to coi binary
+        container_name: Name of the container to probe
+        hostname: Hostname to resolve (default: example.com)
+        timeout: Maximum time to wait in seconds (default: 30)
+
+    Returns:
+        True if the hostname resolved, False if timeout
+
+    Example:
+        assert wait_for_container_dns(coi_binary, container_name)
+    """
+
+    def resolves():
+        try:
+            result = fast_run(
+                [
+                    coi_binary,
+                    "container",
+                    "exec",
+                    container_name,
+                    "--",
+                    "getent",
+                    "hosts",
+                    hostname,
+                ],
+                capture_output=True,
+                timeout=5,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return result.returncode == 0
+
+    return poll_until(resolves, timeout=timeout, interval=0.1, max_interval=1.0)
+
+
+def wait_port_open(host, port, timeout=10):
+    """
+    Wait until a TCP port accepts connections.
+
+    Used after starting a server inside a container (e.g. `python3 -m
+    http.server`) instead of sleeping: each probe is a plain connect with
+    a short timeout, so the wait ends as soon as the server is listening.
+
+    Args:
+        host: Address to connect to
+        port: TCP port to connect to
+        timeout: Maximum time to wait in seconds (default: 10)
+
+    Returns:
+        True if the port accepted a connection, False if timeout
+
+    Example:
+        assert wait_port_open(container_ip, 8000), "HTTP server should start"
+    """
+
+    def accepts():
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return True
+        except OSError:
+            return False
+
+    return poll_until(accepts, timeout=timeout)
+
+
+def wait_container_stopped(container_name, timeout=30):
+    """
+    Wait until a container reports the Stopped state (or no longer exists).
+
+    Replaces a fixed sleep after `coi container stop`: the state is read
+    from the Incus API (falling back to `incus list`), so the wait ends as
+    soon as Incus has finished stopping the container.
+
+    Args:
+        container_name: Name of the container to watch
+        timeout: Maximum time to wait in seconds (default: 30)
+
+    Returns:
+        True if the container is stopped or gone, False if timeout
+
+    Example:
+        assert wait_container_stopped(container_name), "Container should stop"
+    """
+
+    def stopped():
+        try:
+            status = shared_client().instance_status(container_name)
+        except IncusClientError:
+            result = fast_run(
+                ["incus", "list", f"^{container_name}$", "--format=csv", "-c", "s"],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                return False
+            status = result.stdout.strip() or None
+        return status is None or status.lower() == "stopped"
+
+    return poll_until(stopped, timeout=timeout)
+
+
 def wait_for_specific_container_deletion(container_name, timeout=30, poll_interval=0.5):
     """
     Wait for a specific container to be deleted.
@@ -571,23 +866,413 @@ def assert_clean_exit(clean_exit, child):
     assert child.exitstatus == 0, f"Expected exit code 0, got {child.exitstatus}"
 
 
+@functools.cache
+def _resolve_executable(name):
+    """Resolve a bare command name to an absolute path (cached per name)."""
+    if os.path.dirname(name):
+        return name
+    return shutil.which(name) or name
+
+
+def scaled_timeout(seconds):
+    """
+    Scale a test timeout by the COI_TEST_TIMEOUT_SCALE environment variable.
+
+    Fixed timeouts are sized for slow hosts, so a real hang costs the full
+    budget. Set COI_TEST_TIMEOUT_SCALE below 1 (e.g. 0.5) to fail fast in
+    CI, or above 1 on a particularly slow machine. Defaults to 1.0.
+
+    Args:
+        seconds: Nominal timeout in seconds
+
+    Returns:
+        Scaled timeout in seconds (at least 1)
+
+    Example:
+        subprocess.run(args, timeout=scaled_timeout(600))
+    """
+    scale = float(os.environ.get("COI_TEST_TIMEOUT_SCALE", "1.0"))
+    return max(1, int(seconds * scale))
+
+
+def fast_run(args, **kwargs):
+    """
+    subprocess.run() variant for short-lived helper commands.
+
+    CPython only uses the posix_spawn() fast path (instead of fork+exec)
+    when the executable is given as a path and close_fds is False, with no
+    cwd, preexec_fn or pass_fds. This helper resolves args[0] to an absolute
+    path once and disables close_fds (Python-created fds are non-inheritable
+    anyway), so quick incus/coi calls avoid copying the test process's page
+    tables on every spawn.
+
+    Args:
+        args: Command argv list
+        **kwargs: Passed through to subprocess.run (avoid cwd/preexec_fn/pass_fds)
+
+    Returns:
+        subprocess.CompletedProcess
+    """
+    kwargs.setdefault("close_fds", False)
+    return subprocess.run([_resolve_executable(args[0]), *args[1:]], **kwargs)
+
+
+async def run_until_marker(args, markers, timeout=600):
+    """
+    Run a command, streaming its merged stdout/stderr until all markers appear.
+
+    Output is read line by line as it is produced. As soon as every marker
+    has been seen the child is terminated, so a test that only cares about
+    e.g. a build script's self-check does not wait for the rest of the
+    build (image publish, cleanup) to finish.
+
+    Args:
+        args: Command argv list
+        markers: Strings that must all appear in the output
+        timeout: Maximum time to wait in seconds (default: 600)
+
+    Returns:
+        (returncode, output) tuple. returncode is None if the child was
+        stopped early because all markers were seen; otherwise it is the
+        child's exit code (markers may then be missing from output).
+
+    Raises:
+        subprocess.TimeoutExpired: If timeout elapses first
+
+    Example:
+        rc, output = asyncio.run(
+            run_until_marker([coi_binary, "build"], ["DNS resolution works!"])
+        )
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        limit=1 << 20,
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    pending = set(markers)
+    chunks = []
+
+    try:
+        while pending:
+            line = await asyncio.wait_for(proc.stdout.readline(), max(deadline - loop.time(), 0))
+            if not line:
+                break
+            text = line.decode(errors="replace")
+            chunks.append(text)
+            pending = {m for m in pending if m not in text}
+
+        if pending:
+            # Child finished without printing every marker - report its exit code
+            chunks.append((await proc.stdout.read()).decode(errors="replace"))
+            returncode = await asyncio.wait_for(proc.wait(), max(deadline - loop.time(), 0))
+            return returncode, "".join(chunks)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(args, timeout, output="".join(chunks)) from None
+
+    proc.terminate()
+    await proc.wait()
+    return None, "".join(chunks)
+
+
+async def _run_captured(args, timeout, text):
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(args, timeout) from None
+    if text:
+        stdout = stdout.decode(errors="replace")
+        stderr = stderr.decode(errors="replace")
+    return subprocess.CompletedProcess(args, proc.returncode, stdout=stdout, stderr=stderr)
+
+
+def run_concurrently(commands, timeout=30, text=True):
+    """
+    Run independent commands at the same time and wait for all of them.
+
+    Total wall time is that of the slowest command rather than the sum,
+    which helps when several tests inspect different invocations of a
+    command that takes seconds to run (e.g. `coi health`).
+
+    Args:
+        commands: List of argv lists
+        timeout: Maximum time to wait for each command in seconds (default: 30)
+        text: Decode stdout/stderr to str (default: True); pass False to
+            keep bytes when the output is only searched
+
+    Returns:
+        List of CompletedProcess, in the order given
+
+    Raises:
+        subprocess.TimeoutExpired: If any command exceeds the timeout
+
+    Example:
+        plain, verbose = run_concurrently(
+            [[coi_binary, "health"], [coi_binary, "health", "--verbose"]]
+        )
+    """
+
+    async def gather():
+        return await asyncio.gather(*(_run_captured(args, timeout, text) for args in commands))
+
+    return asyncio.run(gather())
+
+
+# Short-lived cache for get_container_list(): (timestamp, names)
+_CONTAINER_LIST_TTL = 0.05
+_container_list_cache = None
+
+
+def invalidate_container_cache():
+    """Drop the cached container list so the next lookup queries Incus."""
+    global _container_list_cache
+    _container_list_cache = None
+
+
 def get_container_list():
     """
-    Get list of all running containers.
-    Returns list of container names.
+    Get the set of all running containers.
+    Returns a frozenset of container names.
+
+    Queries the Incus API over its unix socket when reachable, falling back
+    to the incus CLI otherwise. Results are reused for a very short TTL so
+    tight polling loops don't hammer Incus; call invalidate_container_cache()
+    after changing container state if the next check must be fresh.
     """
+    global _container_list_cache
+
+    now = time.monotonic()
+    if _container_list_cache is not None and now - _container_list_cache[0] < _CONTAINER_LIST_TTL:
+        return _container_list_cache[1]
+
+    containers = _query_container_list()
+    _container_list_cache = (now, containers)
+    return containers
+
+
+def _query_container_list():
+    """Query Incus for container names (uncached)."""
+    try:
+        return frozenset(shared_client().instance_names())
+    except IncusClientError:
+        pass
+
     try:
-        result = subprocess.run(
+        result = fast_run(
             ["sg", "incus-admin", "-c", "incus list --format=csv -c n"],
             capture_output=True,
             text=True,
             check=True,
         )
-        containers = [line.strip() for line in result.stdout.strip().split("\n") if line.strip()]
-        return containers
+        return frozenset(line.strip() for line in result.stdout.split("\n") if line.strip())
     except subprocess.CalledProcessError as e:
         print(f"Warning: Failed to list containers: {e}")
-        return []
+        return frozenset()
+
+
+def coi_image_exists(coi_binary, image_name):
+    """
+    Check whether a coi image alias exists.
+
+    Asks the Incus API directly when the socket is reachable, falling back
+    to `coi image exists` otherwise.
+    """
+    try:
+        return shared_client().image_alias_exists(image_name)
+    except IncusClientError:
+        pass
+
+    result = fast_run([coi_binary, "image", "exists", image_name], capture_output=True)
+    return result.returncode == 0
+
+
+# Container name -> eth0 IPv4 address, see get_container_ipv4()
+_container_ipv4_cache = {}
+_ETH0_IPV4_RE = re.compile(r"(\d+\.\d+\.\d+\.\d+) \(eth0\)")
+
+
+def get_container_ipv4(container_name):
+    """
+    Get the IPv4 address of a container's eth0 interface.
+
+    Asks `incus list` for just the IPv4 column instead of parsing the full
+    JSON state. The address is stable for the lifetime of a container, so
+    it is remembered once found; lookups before DHCP has assigned one
+    return None and are not cached.
+
+    Example:
+        container_ip = get_container_ipv4(container_name)
+    """
+    if container_name in _container_ipv4_cache:
+        return _container_ipv4_cache[container_name]
+
+    result = fast_run(
+        ["incus", "list", f"^{container_name}$", "-c", "4", "--format=csv"],
+        capture_output=True,
+        text=True,
+    )
+    match = _ETH0_IPV4_RE.search(result.stdout) if result.returncode == 0 else None
+    if not match:
+        return None
+
+    _container_ipv4_cache[container_name] = match.group(1)
+    return match.group(1)
+
+
+def run_batch(commands, timeout=30, parallel=False):
+    """
+    Run several independent commands in a single shell invocation.
+
+    Teardown code often issues a handful of unrelated delete/unset calls.
+    Joining them into one `sh -c` saves a fork/exec per command. Each
+    command is followed by `|| true`, so a failure in one does not affect
+    the others (same semantics as check=False on individual calls).
+
+    Args:
+        commands: List of argv lists, e.g. [["incus", "delete", "--force", "c1"], ...]
+        timeout: Timeout for the whole batch in seconds (default: 30)
+        parallel: If True, run the commands as background jobs and wait for
+                  all of them, so the batch takes max(t_i) instead of sum(t_i).
+                  Only use this when the commands touch disjoint resources.
+
+    Returns:
+        subprocess.CompletedProcess of the shell invocation
+    """
+    if parallel:
+        script = " ".join(f"{shlex.join(cmd)} || true &" for cmd in commands) + " wait"
+    else:
+        script = "; ".join(f"{shlex.join(cmd)} || true" for cmd in commands)
+    return fast_run(
+        ["sh", "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
+
+
+class ShellSession:
+    """
+    One long-lived bash, fed commands over stdin.
+
+    Tests that run a series of commands can send them all through one
+    shell instead of forking a new process for each. Every command runs in
+    its own subshell (so `set -e`, `cd` and `exit` don't leak into the next
+    one) with stdin from /dev/null, and its exit status is reported through
+    a unique end-of-command marker. stderr is merged into stdout. If the
+    shell was killed (after a timeout) or died, the next run() starts a
+    fresh one, so one slow command doesn't break every later one.
+
+    Example:
+        shell = ShellSession()
+        result = shell.run(f"{coi_binary} list", timeout=30)
+        assert result.returncode == 0, result.stdout
+        shell.close()
+    """
+
+    def __init__(self, argv=("bash",)):
+        self.argv = list(argv)
+        self._marker = f"__COI_DONE_{uuid.uuid4().hex}__"
+        self._spawn()
+
+    def _spawn(self):
+        self._proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        self._buffer = b""
+
+    def run(self, command, timeout=300):
+        """
+        Run a command and wait for it to finish.
+
+        Args:
+            command: Shell script to run (may span multiple lines)
+            timeout: Maximum time to wait in seconds (default: 300)
+
+        Returns:
+            subprocess.CompletedProcess with merged output in stdout
+
+        Raises:
+            subprocess.TimeoutExpired: If the command doesn't finish in time
+                (the shell is killed; the next run() respawns it)
+        """
+        if self._proc.poll() is not None:
+            self._spawn()
+
+        script = f'(\n{command}\n) < /dev/null 2>&1\necho "{self._marker}$?"\n'
+        self._proc.stdin.write(script.encode())
+        self._proc.stdin.flush()
+
+        marker = self._marker.encode()
+        deadline = time.time() + timeout
+        with selectors.DefaultSelector() as sel:
+            sel.register(self._proc.stdout, selectors.EVENT_READ)
+            while marker not in self._buffer:
+                remaining = deadline - time.time()
+                if remaining <= 0 or not sel.select(remaining):
+                    self.close()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                chunk = os.read(self._proc.stdout.fileno(), 65536)
+                if not chunk:
+                    raise RuntimeError(
+                        f"Shell `{shlex.join(self.argv)}` exited unexpectedly. "
+                        f"Output:\n{self._buffer.decode(errors='replace')}"
+                    )
+                self._buffer += chunk
+
+        output, _, rest = self._buffer.partition(marker)
+        status, _, self._buffer = rest.partition(b"\n")
+        return subprocess.CompletedProcess(
+            command, int(status), stdout=output.decode(errors="replace"), stderr=""
+        )
+
+    def run_args(self, args, timeout=300):
+        """Run one argv list through the shell; see run()."""
+        return self.run(shlex.join(args), timeout=timeout)
+
+    def close(self):
+        """End the shell session."""
+        if self._proc.poll() is None:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+                self._proc.wait()
+
+
+class ContainerShell(ShellSession):
+    """
+    ShellSession running inside a container via `incus exec`.
+
+    Each `incus exec` pays for a new API round-trip, attach and bash
+    startup, so a series of commands in the same container is cheaper
+    through one shell.
+
+    Example:
+        shell = ContainerShell("my-container")
+        result = shell.run("cd /root && ls", timeout=30)
+        assert result.returncode == 0, result.stdout
+        shell.close()
+    """
+
+    def __init__(self, container_name):
+        self.container_name = container_name
+        super().__init__(["incus", "exec", container_name, "--", "bash"])
 
 
 def cleanup_all_test_containers(pattern="coi-test-"):
@@ -609,7 +1294,7 @@ def cleanup_all_test_containers(pattern="coi-test-"):
 
     for container in test_containers:
         try:
-            subprocess.run(
+            fast_run(
                 ["sg", "incus-admin", "-c", f"incus delete -f {container}"],
                 capture_output=True,
                 timeout=10,
@@ -632,6 +1317,21 @@ def get_session_id_from_output(output):
     return None
 
 
+# "Container: <name>" line printed by `coi shell` once the container is up
+_CONTAINER_NAME_RE = re.compile(r"^Container: (\S+)", re.MULTILINE)
+
+
+def get_container_name_from_output(output):
+    """
+    Extract the container name from coi shell output.
+    Looks for the "Container: <name>" line.
+    """
+    match = _CONTAINER_NAME_RE.search(output)
+    if match:
+        return match.group(1)
+    return None
+
+
 def get_latest_session_id():
     """
     Get the most recent session ID from sessions directory.
@@ -733,7 +1433,51 @@ def expect_and_show(child, pattern, timeout=30, description=None):
     return index
 
 
-def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
+def _wait_for_screen(child, check, timeout):
+    """
+    Block on the child's PTY until check(display) returns a truthy value.
+
+    Waits in the kernel (selectors) for the PTY to become readable instead of
+    waking up on a fixed interval, drains whatever is available, and only
+    re-renders the screen after new data arrived.
+
+    Args:
+        child: pexpect.spawn object with TerminalEmulator as logfile_read
+        check: Callable taking the stripped display and returning a result
+        timeout: Timeout in seconds
+
+    Returns:
+        The first truthy value returned by check, or None on timeout/EOF
+    """
+    deadline = time.time() + timeout
+
+    result = check(child.logfile_read.get_display_stripped())
+    if result:
+        return result
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(child.child_fd, selectors.EVENT_READ)
+
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0 or not selector.select(remaining):
+                return None
+
+            try:
+                # Data is automatically fed to logfile_read by pexpect
+                child.read_nonblocking(size=65536, timeout=0)
+            except TIMEOUT:
+                continue
+            except EOF:
+                # Process ended - one last look at what it printed
+                return check(child.logfile_read.get_display_stripped()) or None
+
+            result = check(child.logfile_read.get_display_stripped())
+            if result:
+                return result
+
+
+def wait_for_text_on_screen(child, text, timeout=30):
     """
     Wait for text to appear on the rendered terminal screen (not raw output).
 
@@ -744,7 +1488,6 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
         child: pexpect.spawn object with TerminalEmulator as logfile_read
         text: Text to search for in the rendered display
         timeout: Timeout in seconds
-        poll_interval: How often to check the screen (seconds)
 
     Returns:
         True when text is found
@@ -759,7 +1502,6 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
         )
 
     verbose = child.logfile_read.verbose
-    start_time = time.time()
 
     if verbose:
         print(f"\n{'=' * 60}")
@@ -769,35 +1511,21 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
 
         sys.stdout.flush()
 
-    while time.time() - start_time < timeout:
-        # CRITICAL: Read from child process to trigger data flow
-        # This makes pexpect read from the subprocess and feed it to our TerminalEmulator
-        try:
-            child.read_nonblocking(size=4096, timeout=poll_interval)
-            # Data is automatically fed to logfile_read by pexpect
-        except TIMEOUT:
-            # No data available right now, that's okay
-            pass
-        except EOF:
-            # Process ended
-            break
-
-        # Get the rendered screen display
-        display = child.logfile_read.get_display_stripped()
+    display = _wait_for_screen(child, lambda d: d if text in d else None, timeout)
 
-        if text in display:
-            if verbose:
-                print(f"\n{'=' * 60}")
-                print(">>> TEXT FOUND ON SCREEN!")
-                print(f"{'=' * 60}")
-                print("\n>>> CURRENT SCREEN DISPLAY:")
-                print("--- START DISPLAY ---")
-                print(display)
-                print("--- END DISPLAY ---\n")
-                import sys
+    if display:
+        if verbose:
+            print(f"\n{'=' * 60}")
+            print(">>> TEXT FOUND ON SCREEN!")
+            print(f"{'=' * 60}")
+            print("\n>>> CURRENT SCREEN DISPLAY:")
+            print("--- START DISPLAY ---")
+            print(display)
+            print("--- END DISPLAY ---\n")
+            import sys
 
-                sys.stdout.flush()
-            return True
+            sys.stdout.flush()
+        return True
 
     # Timeout - show what we did see
     display = child.logfile_read.get_display_stripped()
@@ -815,7 +1543,7 @@ def wait_for_text_on_screen(child, text, timeout=30, poll_interval=0.1):
     raise TimeoutError(error_msg)
 
 
-def wait_for_any_text_on_screen(child, texts, timeout=30, poll_interval=0.1):
+def wait_for_any_text_on_screen(child, texts, timeout=30):
     """
     Wait for any of the given texts to appear on the rendered terminal screen.
 
@@ -823,7 +1551,6 @@ def wait_for_any_text_on_screen(child, texts, timeout=30, poll_interval=0.1):
         child: pexpect.spawn object with TerminalEmulator as logfile_read
         texts: List of text strings to search for
         timeout: Timeout in seconds
-        poll_interval: How often to check the screen (seconds)
 
     Returns:
         The text that was found
@@ -835,21 +1562,11 @@ def wait_for_any_text_on_screen(child, texts, timeout=30, poll_interval=0.1):
     if not isinstance(child.logfile_read, TerminalEmulator):
         raise TypeError("wait_for_any_text_on_screen requires TerminalEmulator.")
 
-    start_time = time.time()
-
-    while time.time() - start_time < timeout:
-        try:
-            child.read_nonblocking(size=4096, timeout=poll_interval)
-        except TIMEOUT:
-            pass
-        except EOF:
-            break
-
-        display = child.logfile_read.get_display_stripped()
-
-        for text in texts:
-            if text in display:
-                return text
+    found = _wait_for_screen(
+        child, lambda display: next((t for t in texts if t in display), None), timeout
+    )
+    if found:
+        return found
 
     display = child.logfile_read.get_display_stripped()
     raise TimeoutError(
@@ -1162,11 +1879,20 @@ def get_screen_display(child, refresh=False, clear_buffer=False):
         return ""
 
 
+@functools.cache
+def _workspace_id(workspace_path):
+    """Return the 8-hex-digit workspace ID for an absolute workspace path."""
+    # Hash the workspace path (SHA256) and take first 8 hex characters
+    return hashlib.sha256(workspace_path.encode()).hexdigest()[:8]
+
+
 def calculate_container_name(workspace_dir, slot):
     """
     Calculate the expected container name for a given workspace and slot.
 
     This replicates the container naming logic from internal/session/naming.go.
+    The workspace hash is cached per path, since fixtures such as
+    cleanup_containers compute names for many slots of the same workspace.
 
     Args:
         workspace_dir: Path to workspace directory
@@ -1175,19 +1901,12 @@ def calculate_container_name(workspace_dir, slot):
     Returns:
         Expected container name (e.g., "coi-test-85918044-1")
     """
-    import hashlib
-
     # Get container prefix from environment (defaults to "coi-" but tests use "coi-test-")
     prefix = os.environ.get("COI_CONTAINER_PREFIX", "coi-")
 
-    # Hash the workspace path (SHA256)
     # Use os.path.abspath (not Path.resolve) to match Go's filepath.Abs behavior
     # (abspath doesn't follow symlinks, resolve does)
-    workspace_path = os.path.abspath(workspace_dir)
-    hash_bytes = hashlib.sha256(workspace_path.encode()).digest()
-
-    # Take first 8 hex characters
-    workspace_id = hash_bytes.hex()[:8]
+    workspace_id = _workspace_id(os.path.abspath(workspace_dir))
 
     # Format: {prefix}{hash}-{slot}
     return f"{prefix}{workspace_id}-{slot}"
@@ -0,0 +1,159 @@
+"""
+Minimal Incus REST API client for read-only test queries.
+
+Talks to the local Incus daemon over its unix socket with a persistent
+HTTP/1.1 connection, so frequent queries (instance list, network list)
+don't pay a fork+exec and incus CLI startup each time. Uses only the
+standard library.
+"""
+
+import functools
+import http.client
+import json
+import os
+import socket
+import threading
+from urllib.parse import quote
+
+
+class IncusClientError(Exception):
+    """Raised when the Incus API cannot be reached or returns an error."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection that connects to a unix domain socket."""
+
+    def __init__(self, socket_path, timeout=10):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def default_socket_path():
+    """
+    Return the Incus unix socket path.
+
+    Honours INCUS_SOCKET and INCUS_DIR like the incus CLI does, falling back
+    to /var/lib/incus/unix.socket.
+    """
+    if "INCUS_SOCKET" in os.environ:
+        return os.environ["INCUS_SOCKET"]
+    incus_dir = os.environ.get("INCUS_DIR", "/var/lib/incus")
+    return os.path.join(incus_dir, "unix.socket")
+
+
+class IncusClient:
+    """
+    Persistent connection to the local Incus API.
+
+    Example:
+        client = IncusClient()
+        names = client.instance_names()
+    """
+
+    def __init__(self, socket_path=None, project="default", timeout=10):
+        self.socket_path = socket_path or default_socket_path()
+        self.project = project
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, path):
+        """
+        GET an API path and return the response metadata.
+
+        Reconnects once if the persistent connection was dropped.
+
+        Args:
+            path: API path, e.g. "/1.0/instances"
+
+        Returns:
+            The "metadata" field of the API response
+
+        Raises:
+            IncusClientError: If the socket is unreachable or the API returns an error
+        """
+        sep = "&" if "?" in path else "?"
+        url = f"{path}{sep}project={self.project}"
+
+        with self._lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+                try:
+                    self._conn.request("GET", url)
+                    response = self._conn.getresponse()
+                    body = response.read()
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    self._conn.close()
+                    self._conn = None
+                    if attempt == 1:
+                        raise IncusClientError(f"Incus API request failed: {e}") from e
+
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise IncusClientError(f"Invalid Incus API response for {path}") from e
+
+        if data.get("type") == "error":
+            raise IncusClientError(
+                data.get("error", f"Incus API error for {path}"),
+                status_code=data.get("error_code", response.status),
+            )
+
+        return data.get("metadata")
+
+    def instance_names(self):
+        """Return the names of all instances in the project."""
+        return [url.rsplit("/", 1)[-1] for url in self.get("/1.0/instances") or []]
+
+    def instance_status(self, name):
+        """Return an instance's status (e.g. "Running", "Stopped"), or None if it doesn't exist."""
+        try:
+            state = self.get(f"/1.0/instances/{quote(name, safe='')}/state")
+        except IncusClientError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        return (state or {}).get("status")
+
+    def image_alias_exists(self, alias):
+        """Return True if an image alias exists in the project."""
+        try:
+            self.get(f"/1.0/images/aliases/{quote(alias, safe='')}")
+        except IncusClientError as e:
+            if e.status_code == 404:
+                return False
+            raise
+        return True
+
+    def networks(self):
+        """Return network objects (name, type, managed, ...) for all networks."""
+        return self.get("/1.0/networks?recursion=1") or []
+
+    def network(self, name):
+        """Return the network object (including its config) for one network."""
+        return self.get(f"/1.0/networks/{quote(name, safe='')}") or {}
+
+
+@functools.cache
+def shared_client():
+    """Return a process-wide IncusClient, created on first use."""
+    return IncusClient()